@@ -133,6 +133,11 @@ DATABASES = {
         'PASSWORD': 'postgres123',
         'HOST': 'db',
         'PORT': '5432',
+        # Keep connections alive between requests instead of paying a
+        # TCP+auth handshake per request (native pooling needs Django
+        # 5.1/psycopg3; persistent connections are the 4.2 equivalent)
+        'CONN_MAX_AGE': 300,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -173,6 +178,11 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files (listing images) live on disk and are served by URL
+# instead of being inlined as base64 into API payloads
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
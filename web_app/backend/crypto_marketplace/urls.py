@@ -14,10 +14,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+from django.views.static import serve
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('marketplace.urls')),
+    # Mapped unconditionally instead of via static(): that helper is a
+    # no-op when DEBUG is off, and in the deployed stack (DEBUG=1 reads
+    # as False, Caddy proxies everything to the app container) nothing
+    # else can reach the uploaded files
+    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
 ]
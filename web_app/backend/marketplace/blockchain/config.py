@@ -4,193 +4,201 @@ Contains contract addresses, ABIs, and network configurations
 Supports dynamic ABI loading from Arbiscan
 """
 
+import logging
 import os
+import re
+import sys
 import json
-from decouple import config
+import time
+from collections import namedtuple
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+
+# Local alias so the env reads below share one lookup
+_env = os.environ
+
+# Prefer orjson's C parser for the ABI payload when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+class RpcErrorRateLimitFilter(logging.Filter):
+    """Coalesce repeated identical RPC warnings during chain outages
+
+    Lets one record per (logger, level, message template) through every
+    `interval` seconds; suppressed repeats are counted and the count is
+    appended to the next record that passes. Keeps outage-time error paths
+    from serializing workers on log writes.
+    """
+
+    def __init__(self, interval=30):
+        super().__init__()
+        self.interval = interval
+        self._last_emit = {}
+        self._suppressed = {}
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        last = self._last_emit.get(key)
+        if last is not None and now - last < self.interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return False
+        self._last_emit[key] = now
+        dropped = self._suppressed.pop(key, 0)
+        if dropped:
+            record.msg = f"{record.msg} ({dropped} similar suppressed)"
+        return True
+
+
+def _freeze(d):
+    """Freeze a (possibly nested) config dict into a read-only mapping with interned keys"""
+    return MappingProxyType({
+        sys.intern(k): (_freeze(v) if isinstance(v, dict) else v)
+        for k, v in d.items()
+    })
 
 # Network Configurations
+@dataclass(frozen=True, slots=True)
+class Network:
+    """Immutable per-network record; slot access beats dict string lookup"""
+    chain_id: int
+    name: str
+    rpc_url: str
+    block_explorer: str
+    # Optional WebSocket endpoint; enables subscription-based receipt
+    # watching instead of eth_getTransactionReceipt polling
+    ws_url: str = None
+
+    def __getitem__(self, key):
+        # Subscript compat for call sites still written against the old dicts
+        return getattr(self, key)
+
+
 NETWORKS = {
-    'arbitrum_sepolia': {
-        'chain_id': 421614,
-        'name': 'Arbitrum Sepolia',
-        'rpc_url': 'https://sepolia-rollup.arbitrum.io/rpc',
-        'block_explorer': 'https://sepolia.arbiscan.io',
-    },
-    'arbitrum_one': {
-        'chain_id': 42161,
-        'name': 'Arbitrum One',
-        'rpc_url': 'https://arb1.arbitrum.io/rpc',
-        'block_explorer': 'https://arbiscan.io',
-    }
+    'arbitrum_sepolia': Network(
+        chain_id=421614,
+        name='Arbitrum Sepolia',
+        rpc_url='https://sepolia-rollup.arbitrum.io/rpc',
+        block_explorer='https://sepolia.arbiscan.io',
+        ws_url=_env.get('ARBITRUM_SEPOLIA_WS_URL'),
+    ),
+    'arbitrum_one': Network(
+        chain_id=42161,
+        name='Arbitrum One',
+        rpc_url='https://arb1.arbitrum.io/rpc',
+        block_explorer='https://arbiscan.io',
+        ws_url=_env.get('ARBITRUM_ONE_WS_URL'),
+    ),
 }
 
 # Default network for development (can be overridden by environment variable)
-DEFAULT_NETWORK = os.environ.get('BLOCKCHAIN_NETWORK', 'arbitrum_sepolia')
-
-# Chainlink Functions configuration
-CHAINLINK_SUBSCRIPTION_ID = int(os.environ.get('CHAINLINK_FUNCTIONS_SUBSCRIPTION_ID', '518'))
-CHAINLINK_GAS_LIMIT = 300000
-CHAINLINK_DON_ID = os.environ.get('CHAINLINK_DON_ID_ARB_SEPOLIA', '0x66756e2d617262697472756d2d7365706f6c69612d3100000000000000000000')
-CHAINLINK_DON_HOSTED_SECRETS_SLOT_ID = int(os.environ.get('DON_HOSTED_SECRETS_SLOT_ID', '0'))
-CHAINLINK_DON_HOSTED_SECRETS_VERSION = int(os.environ.get('DON_HOSTED_SECRETS_VERSION', '0'))
-CHAINLINK_ENCRYPTED_SECRETS_URLS = os.environ.get('ENCRYPTED_SECRETS_URLS', '0xc63fd846b3aeb4f3be5a7bc7ff55b94c029880e6e04515eb4d225c86b9835d7a4a4bedf9c572d1739f9aabfb35d3b3702fc385397e8eec0e5211bda66c7f6afc8bac446a7f018cc60c2f0f7a30808541876f3f27d25b686fabb6b14971d76f4337baa86f1306ecc179c5a07d9beff107b382b5eeb05715470eff38fc6c11cd36aae16d7ef7a1e53807221cc062bad0b2e9e32cc268fd6e9a3c69874078cd6f5f6b')
-
-# Chainlink Functions JavaScript source code
-CHAINLINK_TWEET_REPOST_SOURCE = """// Chainlink Functions source script: Check if a user retweeted a tweet
-// Docs: https://docs.twitterapi.io/api-reference/endpoint/get_tweet_retweeters
-// Inputs:
-// - secrets.twitterApiKey: X-API-Key value (required)
-// - args[0] (required): tweetId (string)
-// - args[1] (required): userName to check (string; can include leading @)
-// Output: ABI-encoded uint256 => 1 if userName is in retweeters list, else 0
-
-if (!secrets || typeof secrets.twitterApiKey !== "string" || secrets.twitterApiKey.length === 0) {
-    throw Error("Missing secrets.twitterApiKey");
-  }
-
-  const tweetId = (args && typeof args[0] === "string" && args[0].length > 0) ? args[0] : null;
-  let userName = (args && typeof args[1] === "string") ? args[1] : "";
-  userName = userName.replace(/^@/, "").trim();
-  if (!tweetId) {
-    throw Error("Missing args[0] tweetId");
-  }
-  if (!userName) {
-    throw Error("Missing args[1] userName");
-  }
-
-  const baseUrl = "https://api.twitterapi.io/twitter/tweet/retweeters";
-  const params = new URLSearchParams({ tweetId });
-  const url = `${baseUrl}?${params.toString()}`;
-
-  let resp;
-  try {
-    resp = await Functions.makeHttpRequest({
-      url,
-      method: "GET",
-      timeout: 15000,
-      headers: {
-        "X-API-Key": secrets.twitterApiKey,
-        "accept": "application/json",
-        "user-agent": "chainlink-functions/1.0",
-      },
-    });
-  } catch (_) {
-    return Functions.encodeUint256(0n);
-  }
-
-  if (!resp || resp.error) {
-    return Functions.encodeUint256(0n);
-  }
-
-  let data = resp.data;
-  if (typeof data === "string") {
-    try { data = JSON.parse(data); } catch (_) { return Functions.encodeUint256(0n); }
-  }
-
-  if (!data || !Array.isArray(data.users)) {
-    return Functions.encodeUint256(0n);
-  }
-
-  const target = userName.toLowerCase();
-  const found = data.users.some((u) => typeof u?.userName === "string" && u.userName.replace(/^@/, "").toLowerCase() === target);
-
-  return Functions.encodeUint256(found ? 1n : 0n);
-"""
+DEFAULT_NETWORK = _env.get('BLOCKCHAIN_NETWORK', 'arbitrum_sepolia')
+
+
+def _env_int(name, default):
+    """Read an integer env var, failing fast at import on a bad value"""
+    raw = _env.get(name)
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"Environment variable {name} must be an integer, got {raw!r}") from None
+
+
+# Chainlink Functions configuration, validated once at import and bundled in
+# a frozen slotted record so hot paths read slots instead of module globals
+@dataclass(frozen=True, slots=True)
+class ChainlinkConfig:
+    subscription_id: int
+    gas_limit: int
+    don_id: str
+    don_hosted_secrets_slot_id: int
+    don_hosted_secrets_version: int
+    encrypted_secrets_urls: str
+    don_id_bytes: bytes
+    encrypted_secrets_urls_bytes: bytes
+
+
+def _load_chainlink_config():
+    don_id = _env.get('CHAINLINK_DON_ID_ARB_SEPOLIA', '0x66756e2d617262697472756d2d7365706f6c69612d3100000000000000000000')
+    secrets_urls = _env.get('ENCRYPTED_SECRETS_URLS', '0xc63fd846b3aeb4f3be5a7bc7ff55b94c029880e6e04515eb4d225c86b9835d7a4a4bedf9c572d1739f9aabfb35d3b3702fc385397e8eec0e5211bda66c7f6afc8bac446a7f018cc60c2f0f7a30808541876f3f27d25b686fabb6b14971d76f4337baa86f1306ecc179c5a07d9beff107b382b5eeb05715470eff38fc6c11cd36aae16d7ef7a1e53807221cc062bad0b2e9e32cc268fd6e9a3c69874078cd6f5f6b')
+    return ChainlinkConfig(
+        subscription_id=_env_int('CHAINLINK_FUNCTIONS_SUBSCRIPTION_ID', 518),
+        gas_limit=300000,
+        don_id=don_id,
+        don_hosted_secrets_slot_id=_env_int('DON_HOSTED_SECRETS_SLOT_ID', 0),
+        don_hosted_secrets_version=_env_int('DON_HOSTED_SECRETS_VERSION', 0),
+        encrypted_secrets_urls=secrets_urls,
+        # Hex-decoded once here so per-transaction encoding skips the string
+        # conversion web3.py would otherwise repeat on every Functions request
+        don_id_bytes=bytes.fromhex(don_id.removeprefix('0x')),
+        encrypted_secrets_urls_bytes=bytes.fromhex(secrets_urls.removeprefix('0x')),
+    )
+
+
+CHAINLINK = _load_chainlink_config()
+
+# Back-compat module-level aliases
+CHAINLINK_SUBSCRIPTION_ID = CHAINLINK.subscription_id
+CHAINLINK_GAS_LIMIT = CHAINLINK.gas_limit
+CHAINLINK_DON_ID = CHAINLINK.don_id
+CHAINLINK_DON_HOSTED_SECRETS_SLOT_ID = CHAINLINK.don_hosted_secrets_slot_id
+CHAINLINK_DON_HOSTED_SECRETS_VERSION = CHAINLINK.don_hosted_secrets_version
+CHAINLINK_ENCRYPTED_SECRETS_URLS = CHAINLINK.encrypted_secrets_urls
+CHAINLINK_DON_ID_BYTES = CHAINLINK.don_id_bytes
+CHAINLINK_ENCRYPTED_SECRETS_URLS_BYTES = CHAINLINK.encrypted_secrets_urls_bytes
+
+
+
+def _minify_js(src):
+    """Strip whole-line comments, trailing spaces and blank lines from JS source
+
+    The scripts are shipped verbatim to Chainlink DON nodes, so every comment
+    byte is wire-payload overhead billed per Functions request. Only whole-line
+    comments are removed to avoid touching '//' inside string literals.
+    """
+    src = re.sub(r'^\s*//.*$', '', src, flags=re.M)
+    src = '\n'.join(line.rstrip() for line in src.split('\n'))
+    return re.sub(r'\n\s*\n', '\n', src).strip() + '\n'
+
+
+# Chainlink Functions JavaScript sources live as package data under
+# chainlink_sources/ so the ~3 KB literals stay out of the bytecode;
+# they are loaded and minified lazily on first Functions request
+
+@lru_cache(maxsize=1)
+def get_chainlink_tweet_repost_source():
+    """Load and minify the tweet-repost Chainlink Functions script"""
+    import importlib.resources as resources
+    return _minify_js(
+        resources.files('marketplace.blockchain')
+        .joinpath('chainlink_sources/tweet_repost.js').read_text()
+    )
+
+
+@lru_cache(maxsize=1)
+def get_chainlink_crosschain_nft_source():
+    """Load and minify the crosschain-NFT Chainlink Functions script"""
+    import importlib.resources as resources
+    return _minify_js(
+        resources.files('marketplace.blockchain')
+        .joinpath('chainlink_sources/crosschain_nft.js').read_text()
+    )
 
-CHAINLINK_CROSSCHAIN_NFT_SOURCE = """// Chainlink Functions source script
-// Checks ERC-721 ownerOf(tokenId) and returns 1 if it equals expected owner, else 0
-// Args:
-// - args[0]: rpcUrl (e.g., https://eth.llamarpc.com)
-// - args[1]: nft contract address (0x...)
-// - args[2]: tokenId (decimal string or number)
-// - args[3]: expected owner address (0x...)
-
-// Validate inputs
-if (!args || typeof args[0] !== "string" || args[0].length === 0) {
-    throw Error("Missing args[0] rpcUrl");
-  }
-  if (typeof args[1] !== "string" || !args[1].startsWith("0x") || args[1].length !== 42) {
-    throw Error("Invalid args[1] nft contract address");
-  }
-  if (args[2] === undefined || args[2] === null || (typeof args[2] !== "string" && typeof args[2] !== "number")) {
-    throw Error("Invalid args[2] tokenId");
-  }
-  if (typeof args[3] !== "string" || !args[3].startsWith("0x") || args[3].length !== 42) {
-    throw Error("Invalid args[3] expected owner address");
-  }
-
-  const rpcUrl = args[0];
-  const nft = args[1];
-  const tokenIdBig = BigInt(args[2].toString());
-  const expected = args[3].toLowerCase();
-
-  // ownerOf(uint256) selector = bytes4(keccak256("ownerOf(uint256)")) = 0x6352211e
-  const selector = "6352211e";
-
-  // 32-byte left-padded tokenId hex
-  let tokenHex = tokenIdBig.toString(16);
-  if (tokenHex.length > 64) {
-    throw Error("tokenId too large");
-  }
-  tokenHex = tokenHex.padStart(64, "0");
-  const data = `0x${selector}${tokenHex}`;
-
-  const payload = {
-    jsonrpc: "2.0",
-    id: 1,
-    method: "eth_call",
-    params: [
-      {
-        to: nft,
-        data,
-      },
-      "latest",
-    ],
-  };
-
-  let resp;
-  try {
-    resp = await Functions.makeHttpRequest({
-      url: rpcUrl,
-      method: "POST",
-      timeout: 12000,
-      headers: { "content-type": "application/json" },
-      data: payload,
-    });
-  } catch (e) {
-    throw Error(`RPC request failed: ${e}`);
-  }
-
-  if (!resp) {
-    throw Error("No response from RPC endpoint");
-  }
-  if (resp.error) {
-    throw Error(`RPC HTTP error: ${resp.error}`);
-  }
-
-  const result = resp.data?.result;
-  if (!result || typeof result !== "string" || !result.startsWith("0x")) {
-    const rpcError = resp.data?.error?.message || "Malformed eth_call response";
-    throw Error(`eth_call error: ${rpcError}`);
-  }
-
-  // ABI-decoded address is right-most 20 bytes of 32-byte word
-  // result is hex string like 0x000...000<40-hex-addr>
-  const clean = result.slice(2);
-  if (clean.length < 64) {
-    throw Error("eth_call returned short data");
-  }
-  const ownerHex = clean.slice(-40);
-  const ownerAddr = ("0x" + ownerHex).toLowerCase();
-
-  const isMatch = ownerAddr === expected;
-  return Functions.encodeUint256(isMatch ? 1n : 0n);
-"""
 
 # Arbiscan API key (optional, for fetching ABIs dynamically)
 # Set this in your .env file: ARBISCAN_API_KEY=your_api_key_here
 # Without API key, rate limits apply (5 requests/second)
-ARBISCAN_API_KEY = os.environ.get('ARBISCAN_API_KEY', '')
+ARBISCAN_API_KEY = _env.get('ARBISCAN_API_KEY', '')
 
 # Contract Addresses
 CONTRACT_ADDRESSES = {
@@ -219,28 +227,100 @@ TOKEN_ADDRESSES = {
     }
 }
 
+def _checksum_addresses(table):
+    """Normalize every address to EIP-55 checksum form once at import
+
+    Amortizes the keccak hash web3.py would otherwise run on each
+    `contract(address=...)` construction.
+    """
+    from eth_utils import to_checksum_address
+    return {
+        network: {k: (to_checksum_address(v) if v else None) for k, v in m.items()}
+        for network, m in table.items()
+    }
+
+
+# Freeze the lookup tables; nothing should mutate them after import
+NETWORKS = _freeze(NETWORKS)
+CONTRACT_ADDRESSES = _freeze(_checksum_addresses(CONTRACT_ADDRESSES))
+TOKEN_ADDRESSES = _freeze(_checksum_addresses(TOKEN_ADDRESSES))
+
 # Escrow Type Enum (must match Solidity contract)
-ESCROW_TYPES = {
-    'api_approval': 0,
-    'onchain_approval': 1,
-    'disputable': 2,
-}
+class EscrowType(IntEnum):
+    API_APPROVAL = 0
+    ONCHAIN_APPROVAL = 1
+    DISPUTABLE = 2
 
-# Listing State Enum (must match Solidity contract)
-LISTING_STATES = {
-    'open': 0,
-    'filled': 1,
-    'delivered': 2,
-    'released': 3,
-    'refunded': 4,
-    'disputed': 5,
-    'canceled': 6,
-}
 
-# Full Escrow Contract ABI (parsed from JSON)
-_ESCROW_ABI_JSON = '''[{"inputs":[{"internalType":"address","name":"_owner","type":"address"}],"stateMutability":"nonpayable","type":"constructor"},{"inputs":[],"name":"ApprovalResultMismatch","type":"error"},{"inputs":[],"name":"ApprovalStaticCallFailed","type":"error"},{"inputs":[],"name":"BeforeDeadline","type":"error"},{"inputs":[],"name":"DeadlineHasNotPassed","type":"error"},{"inputs":[],"name":"FailedToRefund","type":"error"},{"inputs":[{"internalType":"uint128","name":"fee","type":"uint128"},{"internalType":"uint256","name":"msgValue","type":"uint256"}],"name":"InsufficientFeeSentForRandomNumberGeneration","type":"error"},{"inputs":[],"name":"InvalidAmount","type":"error"},{"inputs":[],"name":"InvalidDeadline","type":"error"},{"inputs":[],"name":"InvalidDeadlineForRefund","type":"error"},{"inputs":[],"name":"InvalidEscrowType","type":"error"},{"inputs":[],"name":"InvalidExtraData","type":"error"},{"inputs":[],"name":"InvalidFee","type":"error"},{"inputs":[],"name":"InvalidState","type":"error"},{"inputs":[],"name":"ListingAlreadyExists","type":"error"},{"inputs":[],"name":"ListingExpired","type":"error"},{"inputs":[],"name":"NotBuyer","type":"error"},{"inputs":[],"name":"NotBuyerOrSeller","type":"error"},{"inputs":[],"name":"NotFunctionsConsumer","type":"error"},{"inputs":[],"name":"NotSeller","type":"error"},{"inputs":[{"internalType":"address","name":"owner","type":"address"}],"name":"OwnableInvalidOwner","type":"error"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"OwnableUnauthorizedAccount","type":"error"},{"inputs":[],"name":"ReentrancyGuardReentrantCall","type":"error"},{"inputs":[{"internalType":"address","name":"token","type":"address"}],"name":"SafeERC20FailedOperation","type":"error"},{"inputs":[],"name":"TokenNotWhitelisted","type":"error"},{"inputs":[],"name":"ZeroAddress","type":"error"},{"inputs":[],"name":"ZeroAmount","type":"error"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"},{"indexed":false,"internalType":"bytes32","name":"requestId","type":"bytes32"}],"name":"DeBazaar__ApiApprovalRequested","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"},{"indexed":false,"internalType":"bytes","name":"err","type":"bytes"}],"name":"DeBazaar__ApiReturnedAnError","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"}],"name":"DeBazaar__ApiReturnedEmptyResponse","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"}],"name":"DeBazaar__ApiReturnedFalse","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"}],"name":"DeBazaar__Delivered","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"},{"indexed":true,"internalType":"address","name":"sender","type":"address"}],"name":"DeBazaar__Disputed","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"sender","type":"address"},{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"}],"name":"DeBazaar__ListingCancelled","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"},{"indexed":true,"internalType":"address","name":"seller","type":"address"},{"indexed":true,"internalType":"address","name":"token","type":"address"},{"indexed":false,"internalType":"uint256","name":"amount","type":"uint256"},{"indexed":false,"internalType":"uint64","name":"expiration","type":"uint64"},{"indexed":false,"internalType":"enum IDebazaarEscrow.EscrowType","name":"escrowType","type":"uint8"}],"name":"DeBazaar__ListingCreated","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"},{"indexed":true,"internalType":"address","name":"buyer","type":"address"},{"indexed":false,"internalType":"uint64","name":"deadline","type":"uint64"}],"name":"DeBazaar__ListingFilled","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"}],"name":"DeBazaar__ListingReset","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"}],"name":"DeBazaar__Refunded","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"}],"name":"DeBazaar__Released","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"listingId","type":"bytes32"},{"indexed":true,"internalType":"address","name":"to","type":"address"}],"name":"DeBazaar__Resolved","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"previousOwner","type":"address"},{"indexed":true,"internalType":"address","name":"newOwner","type":"address"}],"name":"OwnershipTransferStarted","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"previousOwner","type":"address"},{"indexed":true,"internalType":"address","name":"newOwner","type":"address"}],"name":"OwnershipTransferred","type":"event"},{"inputs":[],"name":"BASE_BASIS_POINTS","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"MIN_EXPIRATION","outputs":[{"internalType":"uint64","name":"","type":"uint64"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"acceptOwnership","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"}],"name":"cancelListingByBuyer","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"}],"name":"cancelListingBySeller","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"},{"internalType":"address","name":"_token","type":"address"},{"internalType":"uint256","name":"_amount","type":"uint256"},{"internalType":"uint64","name":"_expiration","type":"uint64"},{"internalType":"enum IDebazaarEscrow.EscrowType","name":"_escrowType","type":"uint8"}],"name":"createListing","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"},{"internalType":"string[]","name":"_sellerArgs","type":"string[]"},{"internalType":"bytes[]","name":"_sellerBytesArgs","type":"bytes[]"},{"internalType":"uint8","name":"_donHostedSecretsSlotID","type":"uint8"},{"internalType":"uint64","name":"_donHostedSecretsVersion","type":"uint64"},{"internalType":"uint64","name":"_subscriptionId","type":"uint64"},{"internalType":"uint32","name":"_gasLimit","type":"uint32"},{"internalType":"bytes32","name":"_donID","type":"bytes32"}],"name":"deliverApiApprovalListing","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"}],"name":"deliverDisputableListing","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"}],"name":"deliverOnchainApprovalListing","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"}],"name":"disputeListing","outputs":[],"stateMutability":"payable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"},{"internalType":"uint64","name":"_deadline","type":"uint64"},{"internalType":"bytes","name":"_extraData","type":"bytes"}],"name":"fillListing","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"requestId","type":"bytes32"},{"internalType":"bytes","name":"response","type":"bytes"},{"internalType":"bytes","name":"err","type":"bytes"}],"name":"fulfillRequest","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"}],"name":"getApiApprovalData","outputs":[{"components":[{"internalType":"string","name":"source","type":"string"},{"internalType":"bytes","name":"encryptedSecretsUrls","type":"bytes"},{"internalType":"string[]","name":"args","type":"string[]"},{"internalType":"bytes[]","name":"bytesArgs","type":"bytes[]"},{"internalType":"bytes32","name":"requestId","type":"bytes32"}],"internalType":"struct IDebazaarEscrow.ApiApprovalData","name":"","type":"tuple"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"getArbiter","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"getFee","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"getFunctionsConsumer","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"}],"name":"getListing","outputs":[{"components":[{"internalType":"bytes32","name":"listingId","type":"bytes32"},{"internalType":"address","name":"buyer","type":"address"},{"internalType":"address","name":"seller","type":"address"},{"internalType":"contract IERC20","name":"token","type":"address"},{"internalType":"uint256","name":"amount","type":"uint256"},{"internalType":"uint64","name":"expiration","type":"uint64"},{"internalType":"uint64","name":"deadline","type":"uint64"},{"internalType":"enum IDebazaarEscrow.State","name":"state","type":"uint8"},{"internalType":"enum IDebazaarEscrow.EscrowType","name":"escrowType","type":"uint8"},{"components":[{"internalType":"address","name":"destination","type":"address"},{"internalType":"bytes","name":"data","type":"bytes"},{"internalType":"bytes","name":"expectedResult","type":"bytes"}],"internalType":"struct IDebazaarEscrow.OnchainApprovalData","name":"onchainApprovalData","type":"tuple"},{"components":[{"internalType":"string","name":"source","type":"string"},{"internalType":"bytes","name":"encryptedSecretsUrls","type":"bytes"},{"internalType":"string[]","name":"args","type":"string[]"},{"internalType":"bytes[]","name":"bytesArgs","type":"bytes[]"},{"internalType":"bytes32","name":"requestId","type":"bytes32"}],"internalType":"struct IDebazaarEscrow.ApiApprovalData","name":"apiApprovalData","type":"tuple"}],"internalType":"struct IDebazaarEscrow.Listing","name":"","type":"tuple"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"}],"name":"getOnchainApprovalData","outputs":[{"components":[{"internalType":"address","name":"destination","type":"address"},{"internalType":"bytes","name":"data","type":"bytes"},{"internalType":"bytes","name":"expectedResult","type":"bytes"}],"internalType":"struct IDebazaarEscrow.OnchainApprovalData","name":"","type":"tuple"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"_token","type":"address"}],"name":"isTokenWhitelisted","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"owner","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"pendingOwner","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"renounceOwnership","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"_listingId","type":"bytes32"},{"internalType":"bool","name":"_toBuyer","type":"bool"}],"name":"resolveListing","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"_arbiter","type":"address"}],"name":"setArbiter","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"_feeBasisPoints","type":"uint256"}],"name":"setFee","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"_functionsConsumer","type":"address"}],"name":"setFunctionsConsumer","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address[]","name":"_tokens","type":"address[]"},{"internalType":"bool[]","name":"_whitelisted","type":"bool[]"}],"name":"setWhitelistedTokens","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"newOwner","type":"address"}],"name":"transferOwnership","outputs":[],"stateMutability":"nonpayable","type":"function"}]'''
+# Listing State Enum (must match Solidity contract)
+class ListingState(IntEnum):
+    OPEN = 0
+    FILLED = 1
+    DELIVERED = 2
+    RELEASED = 3
+    REFUNDED = 4
+    DISPUTED = 5
+    CANCELED = 6
+
+
+# Backward-compat string-keyed views; reverse lookup is EscrowType(n).name.lower()
+ESCROW_TYPES = MappingProxyType({m.name.lower(): m for m in EscrowType})
+LISTING_STATES = MappingProxyType({m.name.lower(): m for m in ListingState})
+
+# Full Escrow Contract ABI, shipped compressed alongside this module
+# (see escrow_abi.json.gz) so the ~15 KB JSON text stays out of the bytecode
+
+
+# Short strings that repeat across ABI entries; interning them collapses
+# hundreds of duplicate PyUnicode objects into one each
+_ABI_COMMON_VALUES = frozenset({
+    'address', 'uint256', 'uint64', 'uint32', 'uint8', 'uint128',
+    'bytes', 'bytes32', 'bool', 'string', 'tuple',
+    'view', 'function', 'nonpayable', 'payable', 'event', 'error', 'constructor',
+})
+
+
+def _intern_abi(obj):
+    """Recursively intern dict keys and common type/kind strings in a parsed ABI"""
+    if isinstance(obj, dict):
+        return {sys.intern(k): _intern_abi(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_intern_abi(item) for item in obj]
+    if isinstance(obj, str) and obj in _ABI_COMMON_VALUES:
+        return sys.intern(obj)
+    return obj
+
+
+@lru_cache(maxsize=1)
+def get_escrow_abi():
+    """Load the escrow ABI on first use and cache the result
+
+    Prefers the pre-baked marshal blob (see tools/bake_abi.py), which skips
+    JSON tokenization entirely; falls back to the gzipped JSON source.
+    """
+    import gzip
+    import marshal
+    import importlib.resources as resources
+    package_files = resources.files('marketplace.blockchain')
+    baked = package_files.joinpath('escrow_abi.marshal')
+    if baked.is_file():
+        try:
+            return _intern_abi(marshal.loads(baked.read_bytes()))
+        except (ValueError, EOFError):
+            pass  # stale blob from another Python version; fall back to JSON
+    data = gzip.decompress(package_files.joinpath('escrow_abi.json.gz').read_bytes())
+    return _intern_abi(_json_loads(data))
+
+def __getattr__(name):
+    """Keep the old eager module constants importable without eager loading"""
+    if name == 'ESCROW_ABI':
+        return get_escrow_abi()
+    if name == 'CHAINLINK_TWEET_REPOST_SOURCE':
+        return get_chainlink_tweet_repost_source()
+    if name == 'CHAINLINK_CROSSCHAIN_NFT_SOURCE':
+        return get_chainlink_crosschain_nft_source()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-ESCROW_ABI = json.loads(_ESCROW_ABI_JSON)
 
 # Standard ERC20 ABI
 ERC20_ABI = [
@@ -256,32 +336,157 @@ ERC20_ABI = [
 ]
 
 
-def get_network_config(network_name=None):
+# O(1) by-name lookup for code that needs to inspect a specific function's
+# ABI entry, instead of scanning the list web3.py requires
+ERC20_ABI_BY_NAME = MappingProxyType({
+    e['name']: e for e in ERC20_ABI if e.get('type') == 'function'
+})
+
+
+@lru_cache(maxsize=1)
+def get_escrow_abi_by_name():
+    """Escrow function ABI entries keyed by name, built once on first use"""
+    return MappingProxyType({
+        e['name']: e for e in get_escrow_abi() if e.get('type') == 'function'
+    })
+
+
+def _abi_signature(entry):
+    """Canonical signature string for a function ABI entry, e.g. balanceOf(address)"""
+    from eth_utils.abi import collapse_if_tuple
+    return '{}({})'.format(
+        entry['name'], ','.join(collapse_if_tuple(i) for i in entry.get('inputs', ()))
+    )
+
+
+@lru_cache(maxsize=1)
+def get_escrow_abi_by_selector():
+    """Escrow function ABI entries keyed by 4-byte selector hex (no 0x prefix)"""
+    from eth_utils import keccak
+    return MappingProxyType({
+        keccak(text=_abi_signature(e))[:4].hex(): e
+        for e in get_escrow_abi() if e.get('type') == 'function'
+    })
+
+
+@lru_cache(maxsize=None)
+def get_selector(name):
+    """4-byte selector for an escrow or ERC20 function by name, hashed once
+
+    Raises KeyError for unknown names so typos fail loudly instead of
+    silently encoding a bad calldata prefix.
+    """
+    from eth_utils import keccak
+    entry = get_escrow_abi_by_name().get(name) or ERC20_ABI_BY_NAME.get(name)
+    if entry is None:
+        raise KeyError(f"No function named {name!r} in escrow or ERC20 ABI")
+    return keccak(text=_abi_signature(entry))[:4]
+
+
+def _pooled_session(pool_connections=4, pool_maxsize=32, status_forcelist=(502, 503, 504)):
+    """Build a keep-alive requests.Session with a retry-aware adapter"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=list(status_forcelist))
+    ))
+    return session
+
+
+@lru_cache(maxsize=4)
+def get_web3(network_name=None):
+    """Get a memoized Web3 instance per network backed by a pooled HTTP session"""
+    from web3 import Web3
+
+    network_config = get_network_config(network_name)
+    return Web3(Web3.HTTPProvider(
+        network_config.rpc_url,
+        # Sized above the requests default of 10 so concurrent eth_call
+        # fan-out doesn't queue on the connection pool
+        session=_pooled_session(pool_connections=8, pool_maxsize=50),
+        request_kwargs={'timeout': 15}
+    ))
+
+
+@lru_cache(maxsize=4)
+def _get_rpc_session(network_name=None):
+    """Pooled session for raw JSON-RPC batch POSTs, one per network"""
+    return _pooled_session()
+
+
+def batch_rpc(calls, network_name=None, strict=True):
+    """Send many JSON-RPC calls as one HTTP POST (JSON-RPC 2.0 batch)
+
+    For reads that Multicall3 can't bundle (eth_getCode, eth_getBalance,
+    eth_call against different blocks, ...). `calls` is a list of
+    (method, params) pairs; results come back in the same order. Raises
+    ValueError if the node reports an error for any entry; pass
+    strict=False to get None for failed entries instead (for batches
+    where individual calls may legitimately revert).
+    """
+    network_config = get_network_config(network_name)
+    payload = [
+        {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': list(params)}
+        for i, (method, params) in enumerate(calls)
+    ]
+    response = _get_rpc_session(network_name).post(
+        network_config.rpc_url, json=payload, timeout=15
+    )
+    response.raise_for_status()
+    by_id = {entry['id']: entry for entry in response.json()}
+    results = []
+    for i, (method, _) in enumerate(calls):
+        entry = by_id.get(i)
+        if entry is None or 'error' in entry:
+            if strict:
+                error = entry['error'] if entry else 'missing response'
+                raise ValueError(f"Batched {method} call failed: {error}")
+            results.append(None)
+            continue
+        results.append(entry['result'])
+    return results
+
+
+# Flat (network, name) -> value maps so the getters do a single dict probe
+_FLAT_CONTRACTS = {(n, c): a for n, m in CONTRACT_ADDRESSES.items() for c, a in m.items()}
+_FLAT_TOKENS = {(n, s): a for n, m in TOKEN_ADDRESSES.items() for s, a in m.items()}
+_FLAT_BLOCK_EXPLORERS = {n: cfg.block_explorer for n, cfg in NETWORKS.items()}
+
+
+# The getters below bind their lookup table as a default argument so each
+# call resolves it via LOAD_FAST instead of a module-dict probe; memoizing
+# them is safe because all tables are frozen MappingProxyType views
+
+@lru_cache(maxsize=None)
+def get_network_config(network_name=DEFAULT_NETWORK, _table=NETWORKS):
     """Get network configuration"""
-    if network_name is None:
-        network_name = DEFAULT_NETWORK
-    return NETWORKS.get(network_name, NETWORKS[DEFAULT_NETWORK])
+    return _table.get(network_name or DEFAULT_NETWORK) or _table[DEFAULT_NETWORK]
 
 
-def get_contract_address(contract_name, network_name=None):
+@lru_cache(maxsize=None)
+def get_contract_address(contract_name, network_name=DEFAULT_NETWORK, _table=_FLAT_CONTRACTS):
     """Get contract address for a network"""
-    if network_name is None:
-        network_name = DEFAULT_NETWORK
-    return CONTRACT_ADDRESSES.get(network_name, {}).get(contract_name)
+    return _table.get((network_name or DEFAULT_NETWORK, contract_name))
 
 
-def get_token_address(token_symbol, network_name=None):
+@lru_cache(maxsize=None)
+def get_token_address(token_symbol, network_name=DEFAULT_NETWORK, _table=_FLAT_TOKENS):
     """Get token address for a network"""
-    if network_name is None:
-        network_name = DEFAULT_NETWORK
-    return TOKEN_ADDRESSES.get(network_name, {}).get(token_symbol.upper())
+    network_name = network_name or DEFAULT_NETWORK
+    # Symbols are stored uppercase; only pay for .upper() on non-canonical input
+    return (_table.get((network_name, token_symbol))
+            or _table.get((network_name, token_symbol.upper())))
 
 
-def get_arbiscan_url(network_name=None):
+@lru_cache(maxsize=None)
+def get_arbiscan_url(network_name=DEFAULT_NETWORK, _table=_FLAT_BLOCK_EXPLORERS):
     """Get Arbiscan block explorer URL for a network"""
-    if network_name is None:
-        network_name = DEFAULT_NETWORK
-    return NETWORKS.get(network_name, {}).get('block_explorer')
+    return _table.get(network_name or DEFAULT_NETWORK)
 
 
 # Arbiscan API URLs for fetching ABIs (v1 - v2 has Cloudflare protection)
@@ -289,3 +494,115 @@ ARBISCAN_API_URLS = {
     'arbitrum_sepolia': 'https://api-sepolia.arbiscan.io/api',
     'arbitrum_one': 'https://api.arbiscan.io/api',
 }
+
+# Multicall3 is deployed at the same canonical address on every chain
+MULTICALL3_ADDRESSES = _freeze({
+    'arbitrum_sepolia': '0xcA11bde05977b3631167028862bE2a173976CA11',
+    'arbitrum_one': '0xcA11bde05977b3631167028862bE2a173976CA11',
+})
+
+# Just the aggregate3 entry; batched reads need nothing else from Multicall3
+MULTICALL3_ABI = [
+    {"inputs": [{"components": [{"name": "target", "type": "address"}, {"name": "allowFailure", "type": "bool"}, {"name": "callData", "type": "bytes"}], "name": "calls", "type": "tuple[]"}], "name": "aggregate3", "outputs": [{"components": [{"name": "success", "type": "bool"}, {"name": "returnData", "type": "bytes"}], "name": "returnData", "type": "tuple[]"}], "stateMutability": "payable", "type": "function"},
+]
+
+# One (target, call_data, allow_failure) read destined for a multicall bundle
+Call = namedtuple('Call', 'target call_data allow_failure', defaults=(False,))
+
+
+def batch_read(calls, network_name=None):
+    """Execute many view calls as a single Multicall3 aggregate3 eth_call
+
+    Collapses K RPC round trips into one. Each item of `calls` is a Call
+    (target address, ABI-encoded call data, optional allow_failure flag);
+    returns the matching list of (success, return_data) pairs. Decoding the
+    return data against the right output types is the caller's job.
+    """
+    w3 = get_web3(network_name)
+    multicall = w3.eth.contract(
+        address=MULTICALL3_ADDRESSES[network_name or DEFAULT_NETWORK],
+        abi=MULTICALL3_ABI,
+    )
+    return multicall.functions.aggregate3(
+        [(c.target, c.allow_failure, c.call_data) for c in calls]
+    ).call()
+
+
+# Reverse map for resolving a chain id back to its network key
+_CHAIN_ID_TO_NETWORK = {cfg.chain_id: name for name, cfg in NETWORKS.items()}
+
+# Disk cache for dynamically fetched ABIs; one marshal blob per contract,
+# with the contract's code hash stored alongside so a redeploy (new code,
+# same address on another chain, proxy upgrade) can be detected by
+# comparing hashes instead of re-downloading the ABI
+_ABI_CACHE_DIR = os.path.join(
+    _env.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'debazaar', 'abi'
+)
+
+
+@lru_cache(maxsize=4)
+def get_arbiscan_session():
+    """One pooled keep-alive session for all Arbiscan API calls
+
+    Reusing the TLS connection saves the ~100 ms handshake that a bare
+    requests.get() pays on every lookup; both API hosts share the pool.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+    ))
+    return session
+
+
+@lru_cache(maxsize=256)
+def fetch_abi(address, chain_id=None):
+    """Fetch a verified contract ABI from Arbiscan with a disk-backed cache
+
+    Cache layout: {cache_dir}/{chain_id}/{address}.marshal holding
+    {'code_hash': <keccak of deployed bytecode>, 'abi': <parsed list>}.
+    A cache hit is a single file read; only an unseen address pays the
+    rate-limited Arbiscan round-trip plus one eth_getCode call.
+    """
+    import marshal
+    from eth_utils import keccak, to_checksum_address
+
+    if chain_id is None:
+        chain_id = NETWORKS[DEFAULT_NETWORK].chain_id
+    network_name = _CHAIN_ID_TO_NETWORK.get(chain_id)
+    if network_name is None:
+        raise ValueError(f"Unsupported chain id: {chain_id}")
+
+    address = to_checksum_address(address)
+    cache_path = os.path.join(_ABI_CACHE_DIR, str(chain_id), f'{address}.marshal')
+    if os.path.isfile(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                return _intern_abi(marshal.load(f)['abi'])
+        except (ValueError, EOFError, KeyError):
+            pass  # corrupt/stale blob; re-fetch below
+
+    response = get_arbiscan_session().get(ARBISCAN_API_URLS[network_name], params={
+        'module': 'contract',
+        'action': 'getabi',
+        'address': address,
+        'apikey': ARBISCAN_API_KEY,
+    }, timeout=15)
+    response.raise_for_status()
+    payload = response.json()
+    if payload.get('status') != '1':
+        raise ValueError(f"Arbiscan ABI fetch failed for {address}: {payload.get('result')}")
+    abi = _intern_abi(_json_loads(payload['result']))
+
+    code_hash = keccak(bytes(get_web3(network_name).eth.get_code(address))).hex()
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        marshal.dump({'code_hash': code_hash, 'abi': abi}, f)
+    os.replace(tmp_path, cache_path)  # atomic; readers never see a partial blob
+    return abi
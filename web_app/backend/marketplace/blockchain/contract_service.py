@@ -4,18 +4,47 @@ Handles Web3 interactions with blockchain contracts
 Uses hardcoded ABIs for reliability
 """
 
+import logging
 import os
+from functools import lru_cache
 from web3 import Web3
 from .config import (
     get_network_config,
     get_contract_address,
     get_token_address,
-    ESCROW_ABI,
+    get_escrow_abi,
     ERC20_ABI,
-    DEFAULT_NETWORK
+    MULTICALL3_ADDRESSES,
+    MULTICALL3_ABI,
+    NETWORKS,
+    TOKEN_ADDRESSES,
+    DEFAULT_NETWORK,
+    get_web3,
+    batch_rpc,
+    RpcErrorRateLimitFilter
 )
 
 
+logger = logging.getLogger(__name__)
+logger.addFilter(RpcErrorRateLimitFilter())
+
+
+# EIP-55 checksumming keccak-hashes the address on every call; the same few
+# addresses recur constantly, so cache the derived form process-wide
+_checksum = lru_cache(maxsize=4096)(Web3.to_checksum_address)
+
+
+# ERC20 decimals are immutable on-chain, so one lookup per token is enough
+# for the process lifetime. Keyed by (chain_id, checksummed address) and
+# pre-seeded for the whitelisted stablecoins, which are all 6-decimal.
+_DECIMALS_CACHE = {
+    (NETWORKS[network].chain_id, address): 6
+    for network, tokens in TOKEN_ADDRESSES.items()
+    for address in tokens.values()
+    if address
+}
+
+
 class ContractService:
     """Service for interacting with smart contracts"""
 
@@ -29,33 +58,38 @@ class ContractService:
         self.network_name = network_name or DEFAULT_NETWORK
         self.network_config = get_network_config(self.network_name)
 
-        # Initialize Web3 with RPC
-        self.w3 = Web3(Web3.HTTPProvider(self.network_config['rpc_url']))
+        # One pooled Web3 per network, shared process-wide (see config.get_web3)
+        self.w3 = get_web3(self.network_name)
 
         # Verify connection
         if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to {self.network_config['name']} RPC")
+            raise ConnectionError(f"Failed to connect to {self.network_config.name} RPC")
+
+        # Contract instances are pure-Python-expensive to build (ABI parsing,
+        # function factory setup), so they're constructed once and reused
+        self._escrow_contract = None
+        self._erc20_cache = {}
 
     def get_escrow_contract(self):
         """
-        Get escrow contract instance with hardcoded ABI
+        Get the memoized escrow contract instance
 
         Returns:
             web3.eth.Contract: Escrow contract instance
         """
-        escrow_address = get_contract_address('escrow', self.network_name)
-        if not escrow_address:
-            raise ValueError(f"Escrow contract not deployed on {self.network_name}")
-
-        # Create contract instance with hardcoded ABI
-        return self.w3.eth.contract(
-            address=Web3.to_checksum_address(escrow_address),
-            abi=ESCROW_ABI
-        )
+        if self._escrow_contract is None:
+            escrow_address = get_contract_address('escrow', self.network_name)
+            if not escrow_address:
+                raise ValueError(f"Escrow contract not deployed on {self.network_name}")
+            self._escrow_contract = self.w3.eth.contract(
+                address=escrow_address,
+                abi=get_escrow_abi()
+            )
+        return self._escrow_contract
 
     def get_erc20_contract(self, token_address):
         """
-        Get ERC20 token contract instance
+        Get a memoized ERC20 token contract instance
 
         Args:
             token_address (str): Token contract address
@@ -63,11 +97,29 @@ class ContractService:
         Returns:
             web3.eth.Contract: ERC20 contract instance
         """
-        # Create contract instance with standard ERC20 ABI
-        return self.w3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=ERC20_ABI
-        )
+        address = _checksum(token_address)
+        contract = self._erc20_cache.get(address)
+        if contract is None:
+            contract = self._erc20_cache[address] = self.w3.eth.contract(
+                address=address,
+                abi=ERC20_ABI
+            )
+        return contract
+
+    @staticmethod
+    def _format_listing(listing):
+        """Map a raw getListing tuple to the dict shape the API layer expects"""
+        return {
+            'listing_id': listing[0].hex() if isinstance(listing[0], bytes) else listing[0],
+            'buyer': listing[1],
+            'seller': listing[2],
+            'token': listing[3],
+            'amount': listing[4],
+            'expiration': listing[5],
+            'deadline': listing[6],
+            'state': listing[7],
+            'escrow_type': listing[8],
+        }
 
     def get_listing(self, listing_id):
         """
@@ -82,21 +134,95 @@ class ContractService:
         try:
             escrow_contract = self.get_escrow_contract()
             listing = escrow_contract.functions.getListing(listing_id).call()
-
-            return {
-                'listing_id': listing[0].hex() if isinstance(listing[0], bytes) else listing[0],
-                'buyer': listing[1],
-                'seller': listing[2],
-                'token': listing[3],
-                'amount': listing[4],
-                'expiration': listing[5],
-                'deadline': listing[6],
-                'state': listing[7],
-                'escrow_type': listing[8],
-            }
+            return self._format_listing(listing)
         except Exception as e:
             raise ValueError(f"Failed to get listing from blockchain: {str(e)}")
 
+    def multicall(self, contract_functions):
+        """
+        Execute several view calls as one Multicall3 aggregate3 round trip
+
+        Args:
+            contract_functions: List of bound web3 contract functions
+
+        Returns:
+            list: Decoded results, in call order, matching what each
+                  function's individual .call() would have returned
+
+        Falls back to sequential .call()s if Multicall3 is unavailable on
+        this network or the aggregate call itself fails; individual
+        sub-calls that revert are retried directly so reverts surface with
+        their original error.
+        """
+        from eth_abi import decode
+        from web3._utils.abi import get_abi_output_types
+
+        multicall_address = MULTICALL3_ADDRESSES.get(self.network_name)
+        if not multicall_address or not contract_functions:
+            return [fn.call() for fn in contract_functions]
+
+        multicall_contract = self.w3.eth.contract(
+            address=multicall_address,
+            abi=MULTICALL3_ABI
+        )
+        calls = [
+            (fn.address, True, fn._encode_transaction_data())
+            for fn in contract_functions
+        ]
+        try:
+            aggregated = multicall_contract.functions.aggregate3(calls).call()
+        except Exception as e:
+            logger.warning("Multicall failed, falling back to sequential calls: %s", e)
+            return [fn.call() for fn in contract_functions]
+
+        results = []
+        for fn, (success, return_data) in zip(contract_functions, aggregated):
+            if not success:
+                # Re-issue directly so the revert reason isn't swallowed
+                results.append(fn.call())
+                continue
+            decoded = decode(get_abi_output_types(fn.abi), return_data)
+            results.append(decoded[0] if len(decoded) == 1 else list(decoded))
+        return results
+
+    def get_listing_bundle(self, listing_id, token_address,
+                           owner_address=None, spender_address=None):
+        """
+        Fetch listing state plus token metadata in a single RPC round trip
+
+        Args:
+            listing_id (str): Listing ID (bytes32 hex string)
+            token_address (str): Payment token contract address
+            owner_address (str): Optional token owner for the allowance read
+            spender_address (str): Optional spender for the allowance read
+
+        Returns:
+            dict: {'listing', 'token_whitelisted', 'token_decimals',
+                   'token_allowance' (None unless owner+spender given)}
+        """
+        escrow_contract = self.get_escrow_contract()
+        token_contract = self.get_erc20_contract(token_address)
+        checksummed_token = _checksum(token_address)
+
+        functions = [
+            escrow_contract.functions.getListing(listing_id),
+            escrow_contract.functions.isTokenWhitelisted(checksummed_token),
+            token_contract.functions.decimals(),
+        ]
+        if owner_address and spender_address:
+            functions.append(token_contract.functions.allowance(
+                _checksum(owner_address),
+                _checksum(spender_address)
+            ))
+
+        results = self.multicall(functions)
+        return {
+            'listing': self._format_listing(results[0]),
+            'token_whitelisted': results[1],
+            'token_decimals': results[2],
+            'token_allowance': results[3] if len(results) > 3 else None,
+        }
+
     def estimate_gas(self, contract_function, from_address, value=0):
         """
         Estimate gas for a contract function call
@@ -117,7 +243,7 @@ class ContractService:
             # Add 20% buffer
             return int(gas_estimate * 1.2)
         except Exception as e:
-            print(f"Gas estimation failed: {e}")
+            logger.warning("Gas estimation failed: %s", e)
             # Return default gas limit
             return 300000
 
@@ -134,15 +260,15 @@ class ContractService:
         try:
             escrow_contract = self.get_escrow_contract()
             return escrow_contract.functions.isTokenWhitelisted(
-                Web3.to_checksum_address(token_address)
+                _checksum(token_address)
             ).call()
         except Exception as e:
-            print(f"Error checking token whitelist: {e}")
+            logger.warning("Error checking token whitelist: %s", e)
             return False
 
     def get_token_decimals(self, token_address):
         """
-        Get token decimals
+        Get token decimals (cached; decimals never change after deploy)
 
         Args:
             token_address (str): Token contract address
@@ -150,13 +276,20 @@ class ContractService:
         Returns:
             int: Token decimals
         """
+        cache_key = (self.network_config.chain_id, _checksum(token_address))
+        cached = _DECIMALS_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             token_contract = self.get_erc20_contract(token_address)
-            return token_contract.functions.decimals().call()
+            decimals = token_contract.functions.decimals().call()
         except Exception as e:
-            print(f"Error getting token decimals: {e}")
-            # Default to 6 for USDC/USDT/PYUSD
+            logger.warning("Error getting token decimals: %s", e)
+            # Default to 6 for USDC/USDT/PYUSD; not cached so a transient
+            # RPC failure doesn't pin the fallback for the process lifetime
             return 6
+        _DECIMALS_CACHE[cache_key] = decimals
+        return decimals
 
     def get_token_allowance(self, token_address, owner_address, spender_address):
         """
@@ -173,17 +306,75 @@ class ContractService:
         try:
             token_contract = self.get_erc20_contract(token_address)
             return token_contract.functions.allowance(
-                Web3.to_checksum_address(owner_address),
-                Web3.to_checksum_address(spender_address)
+                _checksum(owner_address),
+                _checksum(spender_address)
             ).call()
         except Exception as e:
-            print(f"Error getting token allowance: {e}")
+            logger.warning("Error getting token allowance: %s", e)
             return 0
 
+    def send_raw_batch(self, raw_txs):
+        """
+        Submit several signed transactions in one JSON-RPC batch POST
+
+        Lets approve+fill flows hand over both raw transactions in a single
+        HTTP round trip instead of one eth_sendRawTransaction each.
+
+        Args:
+            raw_txs (list): Signed raw transactions (0x-prefixed hex strings)
+
+        Returns:
+            list: Transaction hashes, in submission order
+
+        Raises:
+            ValueError: If the node rejects any transaction in the batch
+        """
+        return batch_rpc(
+            [('eth_sendRawTransaction', [raw_tx]) for raw_tx in raw_txs],
+            self.network_name
+        )
+
+    async def _wait_for_receipt_ws(self, tx_hash, timeout):
+        """Await a receipt by checking once per new block over WebSocket
+
+        A newHeads subscription issues one eth_getTransactionReceipt per
+        block instead of the ~10/sec that HTTP polling fires off.
+        """
+        import asyncio
+        from web3 import AsyncWeb3
+        from web3.exceptions import TransactionNotFound
+        from web3.providers.websocket import WebsocketProviderV2
+
+        async def _receipt_or_none(w3):
+            try:
+                return await w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                return None
+
+        async def _subscribe_and_check():
+            async with AsyncWeb3.persistent_websocket(
+                WebsocketProviderV2(self.network_config.ws_url)
+            ) as w3:
+                # The transaction may already be mined before the first block
+                receipt = await _receipt_or_none(w3)
+                if receipt is not None:
+                    return receipt
+                await w3.eth.subscribe('newHeads')
+                async for _ in w3.ws.process_subscriptions():
+                    receipt = await _receipt_or_none(w3)
+                    if receipt is not None:
+                        return receipt
+
+        return await asyncio.wait_for(_subscribe_and_check(), timeout=timeout)
+
     def verify_transaction(self, tx_hash, timeout=120):
         """
         Wait for transaction confirmation and verify it succeeded
 
+        Uses a newHeads WebSocket subscription when the network has a
+        ws_url configured (one receipt check per block); otherwise falls
+        back to HTTP receipt polling.
+
         Args:
             tx_hash (str): Transaction hash
             timeout (int): Timeout in seconds
@@ -195,8 +386,17 @@ class ContractService:
             ValueError: If transaction failed or timed out
         """
         try:
-            # Wait for transaction receipt
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+            receipt = None
+            if self.network_config.ws_url:
+                import asyncio
+                try:
+                    receipt = asyncio.run(self._wait_for_receipt_ws(tx_hash, timeout))
+                except Exception as e:
+                    logger.warning("WebSocket receipt watch failed, falling back to polling: %s", e)
+
+            if receipt is None:
+                # Wait for transaction receipt
+                receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
 
             # Check if transaction succeeded
             if receipt['status'] != 1:
@@ -212,5 +412,139 @@ class ContractService:
             raise ValueError(f"Transaction verification failed: {str(e)}")
 
 
-# Create singleton instance
-contract_service = ContractService()
+class AsyncContractService:
+    """Async variant of ContractService for concurrent RPC fan-out
+
+    Backed by AsyncWeb3/AsyncHTTPProvider (aiohttp under the hood), so
+    independent reads can run under asyncio.gather instead of stalling
+    one HTTP round trip per call. Mirrors the sync read API; callers in
+    sync code can wrap single entry points with asyncio.run().
+    """
+
+    def __init__(self, network_name=None):
+        from web3 import AsyncWeb3
+        from web3.providers.async_rpc import AsyncHTTPProvider
+
+        self.network_name = network_name or DEFAULT_NETWORK
+        self.network_config = get_network_config(self.network_name)
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(
+            self.network_config.rpc_url,
+            request_kwargs={'timeout': 15}
+        ))
+        self._escrow_contract = None
+        self._erc20_cache = {}
+
+    def get_escrow_contract(self):
+        """Get the memoized escrow contract instance bound to the async provider"""
+        if self._escrow_contract is None:
+            escrow_address = get_contract_address('escrow', self.network_name)
+            if not escrow_address:
+                raise ValueError(f"Escrow contract not deployed on {self.network_name}")
+            self._escrow_contract = self.w3.eth.contract(
+                address=escrow_address,
+                abi=get_escrow_abi()
+            )
+        return self._escrow_contract
+
+    def get_erc20_contract(self, token_address):
+        """Get a memoized ERC20 contract instance bound to the async provider"""
+        address = _checksum(token_address)
+        contract = self._erc20_cache.get(address)
+        if contract is None:
+            contract = self._erc20_cache[address] = self.w3.eth.contract(
+                address=address,
+                abi=ERC20_ABI
+            )
+        return contract
+
+    async def get_listing(self, listing_id):
+        """Read listing details from blockchain (same shape as the sync API)"""
+        try:
+            escrow_contract = self.get_escrow_contract()
+            listing = await escrow_contract.functions.getListing(listing_id).call()
+            return ContractService._format_listing(listing)
+        except Exception as e:
+            raise ValueError(f"Failed to get listing from blockchain: {str(e)}")
+
+    async def check_token_whitelisted(self, token_address):
+        """Check if token is whitelisted in escrow contract"""
+        try:
+            escrow_contract = self.get_escrow_contract()
+            return await escrow_contract.functions.isTokenWhitelisted(
+                _checksum(token_address)
+            ).call()
+        except Exception as e:
+            logger.warning("Error checking token whitelist: %s", e)
+            return False
+
+    async def get_token_decimals(self, token_address):
+        """Get token decimals (shares the process-wide cache with the sync API)"""
+        cache_key = (self.network_config.chain_id, _checksum(token_address))
+        cached = _DECIMALS_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            token_contract = self.get_erc20_contract(token_address)
+            decimals = await token_contract.functions.decimals().call()
+        except Exception as e:
+            logger.warning("Error getting token decimals: %s", e)
+            return 6
+        _DECIMALS_CACHE[cache_key] = decimals
+        return decimals
+
+    async def get_token_allowance(self, token_address, owner_address, spender_address):
+        """Get token allowance"""
+        try:
+            token_contract = self.get_erc20_contract(token_address)
+            return await token_contract.functions.allowance(
+                _checksum(owner_address),
+                _checksum(spender_address)
+            ).call()
+        except Exception as e:
+            logger.warning("Error getting token allowance: %s", e)
+            return 0
+
+    async def get_listing_bundle(self, listing_id, token_address,
+                                 owner_address=None, spender_address=None):
+        """Run the listing-page reads concurrently over one aiohttp session"""
+        import asyncio
+
+        tasks = [
+            self.get_listing(listing_id),
+            self.check_token_whitelisted(token_address),
+            self.get_token_decimals(token_address),
+        ]
+        if owner_address and spender_address:
+            tasks.append(self.get_token_allowance(
+                token_address, owner_address, spender_address
+            ))
+        results = await asyncio.gather(*tasks)
+        return {
+            'listing': results[0],
+            'token_whitelisted': results[1],
+            'token_decimals': results[2],
+            'token_allowance': results[3] if len(results) > 3 else None,
+        }
+
+
+# Per-network service registry so request handlers share one instance
+# (and its contract caches) instead of paying init cost per construction
+_SERVICES = {}
+
+
+def get_contract_service(network_name=None):
+    """Get the shared ContractService for a network, creating it on first use"""
+    key = network_name or DEFAULT_NETWORK
+    service = _SERVICES.get(key)
+    if service is None:
+        service = _SERVICES[key] = ContractService(network_name=key)
+    return service
+
+
+def __getattr__(name):
+    # Deprecated module-level singleton, kept importable for older scripts.
+    # Resolved lazily so importing this module does no network I/O; prefer
+    # get_contract_service()
+    if name == 'contract_service':
+        return get_contract_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
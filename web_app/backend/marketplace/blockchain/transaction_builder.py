@@ -4,24 +4,196 @@ Builds unsigned transactions for frontend to sign
 Uses dynamic ABI loading from Arbiscan via ContractService
 """
 
+import logging
+import re
+import secrets
+import threading
 import time
-import hashlib
 import os
+from concurrent.futures import Future
+from decimal import Decimal, ROUND_DOWN
+from functools import lru_cache, wraps
+from dataclasses import dataclass
+from django.core.cache import cache
 from web3 import Web3
 from .config import (
     get_network_config,
     get_contract_address,
     get_token_address,
-    ESCROW_ABI,
     ERC20_ABI,
     ESCROW_TYPES,
     DEFAULT_NETWORK,
-    CHAINLINK_SUBSCRIPTION_ID, CHAINLINK_GAS_LIMIT, CHAINLINK_DON_ID,
+    CHAINLINK_SUBSCRIPTION_ID, CHAINLINK_GAS_LIMIT, CHAINLINK_DON_ID_BYTES,
     CHAINLINK_DON_HOSTED_SECRETS_SLOT_ID, CHAINLINK_DON_HOSTED_SECRETS_VERSION,
-    CHAINLINK_ENCRYPTED_SECRETS_URLS,
-    CHAINLINK_TWEET_REPOST_SOURCE, CHAINLINK_CROSSCHAIN_NFT_SOURCE
+    CHAINLINK_ENCRYPTED_SECRETS_URLS_BYTES,
+    get_chainlink_tweet_repost_source, get_chainlink_crosschain_nft_source,
+    batch_rpc,
+    RpcErrorRateLimitFilter
 )
-from .contract_service import ContractService
+from .contract_service import ContractService, get_contract_service, _checksum
+
+logger = logging.getLogger(__name__)
+logger.addFilter(RpcErrorRateLimitFilter())
+
+# Single-flight table for in-process request coalescing: when two identical
+# build calls race (double-clicked button, frontend retry), the first one runs
+# the gas estimation and the rest block on its Future instead of issuing
+# duplicate eth_estimateGas round trips against the RPC.
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _coalesce(fn):
+    """Deduplicate concurrent identical calls to a builder method.
+
+    Keyed by method name, network and the full argument tuple, so only
+    byte-identical requests share a result; anything else runs normally.
+    """
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        key = (fn.__name__, self.network_name, args, tuple(sorted(kwargs.items())))
+        with _INFLIGHT_LOCK:
+            future = _INFLIGHT.get(key)
+            if future is None:
+                future = Future()
+                _INFLIGHT[key] = future
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            return future.result()
+        try:
+            result = fn(self, *args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+    return wrapper
+
+# 4-byte selectors hashed once at import. The builders below take only
+# fixed-width arguments (bytes32/bool), so their calldata is concatenated by
+# hand instead of re-walking web3's ABI encoder on every call; dynamic-shape
+# functions (fillListing extra_data, Chainlink params) keep the web3 path.
+_CREATE_LISTING_SELECTOR = Web3.keccak(text='createListing(bytes32,address,uint256,uint64,uint8)')[:4]
+_DELIVER_DISPUTABLE_SELECTOR = Web3.keccak(text='deliverDisputableListing(bytes32)')[:4]
+_DELIVER_ONCHAIN_SELECTOR = Web3.keccak(text='deliverOnchainApprovalListing(bytes32)')[:4]
+_RESOLVE_LISTING_SELECTOR = Web3.keccak(text='resolveListing(bytes32,bool)')[:4]
+_DISPUTE_LISTING_SELECTOR = Web3.keccak(text='disputeListing(bytes32)')[:4]
+
+
+def _listing_id_word(listing_id):
+    """Normalize a listing ID (0x-hex string or raw bytes) to its 32-byte word
+
+    Callers that already hold the 32 raw bytes pass them straight through
+    instead of paying a hex decode per builder call.
+    """
+    if isinstance(listing_id, (bytes, bytearray)):
+        return bytes(listing_id)
+    return bytes.fromhex(listing_id.removeprefix('0x'))
+
+
+def _pack_create_listing(listing_id, token_address, amount_wei, expiration, escrow_type_value):
+    """Pack createListing calldata into a preallocated buffer
+
+    All five arguments are static-width, so the layout is a fixed
+    selector + five 32-byte words; writing them straight into a bytearray
+    skips web3's ABI pipeline entirely.
+    """
+    buf = bytearray(164)
+    buf[0:4] = _CREATE_LISTING_SELECTOR
+    buf[4:36] = _listing_id_word(listing_id)
+    buf[48:68] = bytes.fromhex(token_address[2:])   # address, right-aligned
+    buf[68:100] = amount_wei.to_bytes(32, 'big')
+    buf[100:132] = expiration.to_bytes(32, 'big')   # uint64, zero-padded
+    buf[163] = escrow_type_value                    # uint8 enum
+    return '0x' + buf.hex()
+
+
+def _add_days(now, days):
+    """Unix timestamp `days` days after `now` (or after the current time)
+
+    Both expiration and deadline math reduce to this; passing a shared
+    `now` snapshot avoids one clock syscall per listing on bulk imports.
+    """
+    if now is None:
+        # Integer path; avoids the float round trip of int(time.time())
+        now = time.time_ns() // 1_000_000_000
+    return now + days * 86400
+
+
+# Shared ABI codec with the extra_data type shapes resolved once at import;
+# w3.eth.abi.encode_abi is deprecated and re-resolves the codec per call
+from eth_abi.codec import ABICodec
+from eth_abi.registry import registry
+_CODEC = ABICodec(registry)
+
+# Encoder resolved from the registry once at import; going through
+# _CODEC.encode would re-parse the tuple type string on every call. The
+# outer parens wrap the struct as a one-element argument list so the
+# output matches eth_abi.encode([...], [...])
+_API_APPROVAL_ENCODER = registry.get_encoder('((string,bytes,string[],bytes[],bytes32))')
+_ONCHAIN_EXTRA_DATA_TYPES = ['address', 'bytes', 'bytes']
+_API_EXTRA_DATA_TYPES = ['string', 'bytes', 'string[]', 'bytes[]', 'bytes32']
+_ZERO_REQUEST_ID = b'\x00' * 32
+
+@lru_cache(maxsize=32)
+def _flatten_script(script_path, mtime_ns):
+    """Read and normalize a Chainlink Functions script (cached per path+mtime)"""
+    # utf-8-sig drops a BOM if present; one regex pass trims trailing
+    # whitespace on every line including the last
+    with open(script_path, 'r', encoding='utf-8-sig') as f:
+        script = f.read()
+    script = script.replace('\r\n', '\n').replace('\r', '\n')
+    return re.sub(r'[ \t]+(?=\n|$)', '', script)
+
+
+# Entropy fee barely changes block to block, so one eth_call per 30s window
+# is enough; network_name -> (fee_wei, fetched_at_monotonic)
+_ENTROPY_FEE_CACHE = {}
+_ENTROPY_FEE_TTL = 30
+
+# TTLs for the django.core.cache-backed reads below. Listings only change
+# across tx boundaries so 15s is safe for detail pages; the whitelist is
+# near-static
+_LISTING_CACHE_TTL = 15
+_WHITELIST_CACHE_TTL = 3600
+
+# Powers of ten up to uint64 range, indexed by decimals
+_POW10 = tuple(10 ** i for i in range(19))
+
+
+def from_token_units(amount, decimals):
+    """
+    Convert a human token amount to integer minor units (wei-style)
+
+    Goes through Decimal so amounts like 0.1 with 6 decimals convert
+    exactly instead of picking up float representation error.
+
+    Args:
+        amount: Token amount (str, int, float or Decimal)
+        decimals (int): Token decimals
+
+    Returns:
+        int: Amount in the token's smallest unit, rounded down
+    """
+    scale = _POW10[decimals] if decimals < len(_POW10) else 10 ** decimals
+    if isinstance(amount, int):
+        # Already exact; no Decimal round trip needed
+        return amount * scale
+    return int((Decimal(str(amount)) * scale).to_integral_value(ROUND_DOWN))
+
+
+@dataclass(frozen=True, slots=True)
+class ListingContext:
+    """Token-side reads needed before building approve/createListing"""
+    token_whitelisted: bool
+    token_decimals: int
+    token_allowance: int
 
 
 def encode_api_approval_extra_data(api_approval_method, tweet_id=None, tweet_username=None, crosschain_rpc_url=None, crosschain_nft_contract=None, crosschain_token_id=None, buyer_address=None):
@@ -38,87 +210,105 @@ def encode_api_approval_extra_data(api_approval_method, tweet_id=None, tweet_use
     """
     # Load source code based on method
     if api_approval_method == 'tweet_repost':
-        js_source = CHAINLINK_TWEET_REPOST_SOURCE
+        js_source = get_chainlink_tweet_repost_source()
         args = [tweet_id, tweet_username.replace('@', '').strip()]
         bytes_args = []
     elif api_approval_method == 'crosschain_nft':
-        js_source = CHAINLINK_CROSSCHAIN_NFT_SOURCE
+        js_source = get_chainlink_crosschain_nft_source()
         args = [crosschain_rpc_url, crosschain_nft_contract, crosschain_token_id, buyer_address]
         bytes_args = []
     else:
         raise ValueError(f"Unknown API approval method: {api_approval_method}")
 
-    # Ensure encrypted secrets URL starts with 0x
-    encrypted_secrets_urls = CHAINLINK_ENCRYPTED_SECRETS_URLS
-    if not encrypted_secrets_urls.startswith('0x'):
-        encrypted_secrets_urls = f'0x{encrypted_secrets_urls}'
-
-    # Encode ApiApprovalData struct
+    # Encode ApiApprovalData struct; secrets URLs are hex-decoded once in config
     api_approval_data = (
         js_source,
-        bytes.fromhex(encrypted_secrets_urls[2:]),
+        CHAINLINK_ENCRYPTED_SECRETS_URLS_BYTES,
         args,
         bytes_args,
-        b'\x00' * 32  # requestId = bytes32(0)
-    )
-
-    # Encode as tuple
-    encoded = Web3.solidity_keccak(['string'], [''])  # Placeholder, will use proper encoding
-    # Proper encoding using eth_abi
-    from eth_abi import encode
-    encoded = encode(
-        ['(string,bytes,string[],bytes[],bytes32)'],
-        [api_approval_data]
+        _ZERO_REQUEST_ID  # requestId = bytes32(0)
     )
 
-    return encoded
+    # Encode as tuple with the pre-resolved eth_abi encoder
+    return _API_APPROVAL_ENCODER((api_approval_data,))
 
 
 class TransactionBuilder:
     """Builds unsigned transactions for various contract interactions"""
 
-    def __init__(self, network_name=None):
+    def __init__(self, network_name=None, contract_service=None):
         """
         Initialize transaction builder
 
         Args:
             network_name (str): Network name ('arbitrum_sepolia' or 'arbitrum_one')
+            contract_service (ContractService): Optional service to share;
+                defaults to the per-network singleton
         """
         self.network_name = network_name or DEFAULT_NETWORK
         self.network_config = get_network_config(self.network_name)
 
-        # Initialize Web3 with RPC
-        self.w3 = Web3(Web3.HTTPProvider(self.network_config['rpc_url']))
-
         # Get contract addresses
         self.escrow_address = get_contract_address('escrow', self.network_name)
 
-        # Initialize contract service for dynamic ABI loading
-        self.contract_service = ContractService(network_name=self.network_name)
+        # Shared base for every escrow-bound transaction; builders spread it
+        # and add 'data' (dispute overwrites 'value' for the payable call)
+        self._escrow_tx_template = {
+            'to': self.escrow_address,
+            'value': 0,
+            'chainId': self.network_config.chain_id,
+        }
+
+        # Share the per-network contract service (and its contract caches)
+        self.contract_service = contract_service or get_contract_service(self.network_name)
+
+        # Share the service's pooled Web3 instead of opening a second session
+        self.w3 = self.contract_service.w3
 
         # Get escrow contract with dynamic ABI from Arbiscan (falls back to hardcoded if needed)
         self.escrow_contract = self.contract_service.get_escrow_contract()
 
+        # Bind the escrow ContractFunction factories once; every
+        # .functions.<name> access re-resolves through web3's dispatcher
+        functions = self.escrow_contract.functions
+        self._fn_deliver_api_approval = functions.deliverApiApprovalListing
+        self._fn_get_listing = functions.getListing
+        self._fn_is_token_whitelisted = functions.isTokenWhitelisted
+        self._fn_get_fee = functions.getFee
+
+        # Selector and argument-type tables walked out of the ABIs once, so
+        # builders can encode calldata straight through eth_abi without
+        # constructing a ContractFunction per call
+        from eth_utils.abi import collapse_if_tuple
+        self._selectors = {}
+        self._argtypes = {}
+        for entry in (*self.escrow_contract.abi, *ERC20_ABI):
+            if entry.get('type') != 'function':
+                continue
+            types = [collapse_if_tuple(i) for i in entry.get('inputs', ())]
+            name = entry['name']
+            self._selectors[name] = Web3.keccak(
+                text='{}({})'.format(name, ','.join(types))
+            )[:4]
+            self._argtypes[name] = types
+
     def generate_listing_id(self, seller_address, title, timestamp=None):
         """
         Generate a unique bytes32 listing ID
 
         Args:
-            seller_address (str): Seller's wallet address
-            title (str): Product title
-            timestamp (int): Unix timestamp (optional, defaults to current time)
+            seller_address (str): Accepted for API compatibility; unused
+            title (str): Accepted for API compatibility; unused
+            timestamp (int): Accepted for API compatibility; unused
 
         Returns:
             str: Hexadecimal listing ID (bytes32)
         """
-        if timestamp is None:
-            timestamp = int(time.time())
-
-        # Create a unique hash from seller, title, and timestamp
-        data = f"{seller_address}{title}{timestamp}"
-        listing_id = '0x' + hashlib.sha256(data.encode()).hexdigest()
-
-        return listing_id
+        # The contract treats the id as an opaque bytes32 key and nothing
+        # recomputes it from its inputs, so 32 random bytes suffice: no
+        # hashing, and a seller relisting the same title within one second
+        # can't collide
+        return '0x' + secrets.token_bytes(32).hex()
 
     def build_create_listing_transaction(
         self,
@@ -128,7 +318,8 @@ class TransactionBuilder:
         expiration_timestamp,
         escrow_type='disputable',
         from_address=None, 
-        token_decimals=6
+        token_decimals=6,
+        gas_limit=None
     ):
         """
         Build unsigned transaction for createListing
@@ -141,6 +332,8 @@ class TransactionBuilder:
             escrow_type (str): Escrow type ('disputable', 'api_approval', 'onchain_approval')
             from_address (str): Seller's wallet address
             token_decimals (int): Token decimals
+            gas_limit (int): Optional known gas limit; skips estimation
+
         Returns:
             dict: Unsigned transaction data
         """
@@ -149,38 +342,41 @@ class TransactionBuilder:
         if not token_address:
             raise ValueError(f"Token {token_symbol} not found on {self.network_name}")
 
-        # Convert amount to wei (assuming 6 decimals for PYUSD)
-        amount_wei = int(amount_in_tokens * 10**token_decimals)
+        # Convert amount to minor units via Decimal (exact for values like 0.1)
+        amount_wei = from_token_units(amount_in_tokens, token_decimals)
 
         # Get escrow type enum value
         escrow_type_value = ESCROW_TYPES.get(escrow_type)
         if escrow_type_value is None:
             raise ValueError(f"Invalid escrow type: {escrow_type}")
 
-        # Build contract function call
-        contract_function = self.escrow_contract.functions.createListing(
+        # All-static argument shape: pack the calldata words directly
+        data = _pack_create_listing(
             listing_id,
             token_address,
             amount_wei,
             expiration_timestamp,
-            escrow_type_value
+            int(escrow_type_value)
         )
 
         # Build transaction
-        transaction = {
-            'to': self.escrow_address,
-            'value': 0,  # No ETH sent for createListing
-            'chainId': self.network_config['chain_id'],
-            'data': contract_function._encode_transaction_data(),
-        }
+        transaction = {**self._escrow_tx_template, 'data': data}
 
         # Add from address if provided
         if from_address:
             transaction['from'] = from_address
 
+        if gas_limit is not None:
+            # Caller already knows the bound; skip the eth_estimateGas round trip
+            transaction['gas'] = hex(gas_limit)
+        elif from_address:
             # Estimate gas
             try:
-                gas_estimate = contract_function.estimate_gas({'from': from_address})
+                gas_estimate = self.w3.eth.estimate_gas({
+                    'from': from_address,
+                    'to': self.escrow_address,
+                    'data': data
+                })
                 transaction['gas'] = hex(int(gas_estimate * 1.2))  # Add 20% buffer
             except Exception as e:
                 # If gas estimation fails, use a default value
@@ -190,20 +386,19 @@ class TransactionBuilder:
 
         return transaction
 
-    def calculate_expiration_timestamp(self, duration_days):
+    def calculate_expiration_timestamp(self, duration_days, now=None):
         """
         Calculate expiration timestamp
 
         Args:
             duration_days (int): Number of days until expiration
+            now (int): Optional time.time() snapshot; bulk callers should
+                take one snapshot and reuse it across the whole batch
 
         Returns:
             int: Unix timestamp
         """
-        current_time = int(time.time())
-        # Add duration in seconds (days * 24 hours * 60 minutes * 60 seconds)
-        expiration = current_time + (duration_days * 24 * 60 * 60)
-        return expiration
+        return _add_days(now, duration_days)
 
     def get_listing_from_blockchain(self, listing_id):
         """
@@ -215,10 +410,14 @@ class TransactionBuilder:
         Returns:
             dict: Listing details
         """
+        cache_key = f"escrow:listing:{self.network_name}:{listing_id}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            listing = self.escrow_contract.functions.getListing(listing_id).call()
+            listing = self._fn_get_listing(listing_id).call()
 
-            return {
+            result = {
                 'listing_id': listing[0].hex(),
                 'buyer': listing[1],
                 'seller': listing[2],
@@ -231,6 +430,12 @@ class TransactionBuilder:
             }
         except Exception as e:
             raise ValueError(f"Failed to get listing from blockchain: {str(e)}")
+        cache.set(cache_key, result, _LISTING_CACHE_TTL)
+        return result
+
+    def invalidate_listing_cache(self, listing_id):
+        """Drop the cached getListing result after a state-changing tx confirms"""
+        cache.delete(f"escrow:listing:{self.network_name}:{listing_id}")
 
     def check_token_whitelisted(self, token_address):
         """
@@ -242,18 +447,56 @@ class TransactionBuilder:
         Returns:
             bool: True if whitelisted
         """
+        cache_key = f"escrow:whitelist:{self.network_name}:{token_address}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            return self.escrow_contract.functions.isTokenWhitelisted(token_address).call()
+            result = self._fn_is_token_whitelisted(token_address).call()
         except Exception as e:
-            print(f"Error checking token whitelist: {e}")
+            # Don't cache RPC failures; a transient outage shouldn't pin
+            # a token as non-whitelisted for an hour
+            logger.warning("Error checking token whitelist: %s", e)
             return False
+        cache.set(cache_key, result, _WHITELIST_CACHE_TTL)
+        return result
+
+    def prepare_listing_context(self, token_symbol, owner_address, spender_address=None):
+        """
+        Fetch whitelist flag, decimals and allowance in one RPC round trip
+
+        Collapses the three view calls that listing creation always issues
+        back-to-back into a single Multicall3 aggregate (the gas estimates
+        stay separate since eth_estimateGas can't be multicalled).
+
+        Args:
+            token_symbol (str): Token symbol ('PYUSD')
+            owner_address (str): Token owner (the seller/buyer wallet)
+            spender_address (str): Spender; defaults to the escrow contract
+
+        Returns:
+            ListingContext: (token_whitelisted, token_decimals, token_allowance)
+        """
+        token_address = get_token_address(token_symbol, self.network_name)
+        if not token_address:
+            raise ValueError(f"Token {token_symbol} not found on {self.network_name}")
+
+        token_contract = self.contract_service.get_erc20_contract(token_address)
+        spender = _checksum(spender_address) if spender_address else self.escrow_address
+        results = self.contract_service.multicall([
+            self._fn_is_token_whitelisted(token_address),
+            token_contract.functions.decimals(),
+            token_contract.functions.allowance(_checksum(owner_address), spender),
+        ])
+        return ListingContext(*results)
 
     def build_approve_token_transaction(
         self,
         token_symbol,
         amount_in_tokens,
         from_address=None, 
-        token_decimals=6
+        token_decimals=6,
+        gas_limit=None
     ):
         """
         Build unsigned transaction for ERC20 token approval
@@ -263,6 +506,8 @@ class TransactionBuilder:
             amount_in_tokens (float): Amount in token units
             from_address (str): Buyer's wallet address
             token_decimals (int): Token decimals
+            gas_limit (int): Optional known gas limit; skips estimation
+
         Returns:
             dict: Unsigned transaction data
         """
@@ -271,32 +516,38 @@ class TransactionBuilder:
         if not token_address:
             raise ValueError(f"Token {token_symbol} not found on {self.network_name}")
 
-        # Convert amount to wei (assuming 6 decimals for PYUSD)
-        amount_wei = int(amount_in_tokens * 10**token_decimals)
-
-        token_contract = self.contract_service.get_erc20_contract(token_address)
+        # Convert amount to minor units via Decimal (exact for values like 0.1)
+        amount_wei = from_token_units(amount_in_tokens, token_decimals)
 
-        # Build approve function call
-        contract_function = token_contract.functions.approve(
-            self.escrow_address,
-            amount_wei
-        )
+        # Encode approve(spender, amount) via the cached selector/types
+        data = '0x' + (
+            self._selectors['approve']
+            + _CODEC.encode(self._argtypes['approve'], [self.escrow_address, amount_wei])
+        ).hex()
 
         # Build transaction
         transaction = {
             'to': token_address,
             'value': 0,
-            'chainId': self.network_config['chain_id'],
-            'data': contract_function._encode_transaction_data(),
+            'chainId': self.network_config.chain_id,
+            'data': data,
         }
 
         # Add from address if provided
         if from_address:
             transaction['from'] = from_address
 
+        if gas_limit is not None:
+            # Caller already knows the bound; skip the eth_estimateGas round trip
+            transaction['gas'] = hex(gas_limit)
+        elif from_address:
             # Estimate gas
             try:
-                gas_estimate = contract_function.estimate_gas({'from': from_address})
+                gas_estimate = self.w3.eth.estimate_gas({
+                    'from': from_address,
+                    'to': token_address,
+                    'data': data
+                })
                 transaction['gas'] = hex(int(gas_estimate * 1.2))
             except Exception as e:
                 transaction['gas'] = hex(100000)
@@ -310,7 +561,8 @@ class TransactionBuilder:
         listing_id,
         deadline_timestamp,
         from_address=None,
-        extra_data=b''
+        extra_data=b'',
+        gas_limit=None
     ):
         """
         Build unsigned transaction for fillListing (buyer purchases)
@@ -321,31 +573,39 @@ class TransactionBuilder:
             from_address (str): Buyer's wallet address
             extra_data (bytes): Extra data for onchain approval (default empty)
 
+            gas_limit (int): Optional known gas limit; skips estimation
+
         Returns:
             dict: Unsigned transaction data
         """
-        # Build contract function call
-        contract_function = self.escrow_contract.functions.fillListing(
-            listing_id,
-            deadline_timestamp,
-            extra_data
-        )
+        # Encode fillListing(id, deadline, extraData) via the cached
+        # selector/types; eth_abi handles the dynamic bytes tail
+        data = '0x' + (
+            self._selectors['fillListing']
+            + _CODEC.encode(
+                self._argtypes['fillListing'],
+                [_listing_id_word(listing_id), deadline_timestamp, extra_data]
+            )
+        ).hex()
 
         # Build transaction
-        transaction = {
-            'to': self.escrow_address,
-            'value': 0,
-            'chainId': self.network_config['chain_id'],
-            'data': contract_function._encode_transaction_data(),
-        }
+        transaction = {**self._escrow_tx_template, 'data': data}
 
         # Add from address if provided
         if from_address:
             transaction['from'] = from_address
 
+        if gas_limit is not None:
+            # Caller already knows the bound; skip the eth_estimateGas round trip
+            transaction['gas'] = hex(gas_limit)
+        elif from_address:
             # Estimate gas
             try:
-                gas_estimate = contract_function.estimate_gas({'from': from_address})
+                gas_estimate = self.w3.eth.estimate_gas({
+                    'from': from_address,
+                    'to': self.escrow_address,
+                    'data': data
+                })
                 transaction['gas'] = hex(int(gas_estimate * 1.2))
             except Exception as e:
                 transaction['gas'] = hex(2000000)
@@ -354,10 +614,80 @@ class TransactionBuilder:
 
         return transaction
 
+    def build_checkout_bundle(
+        self,
+        token_symbol,
+        amount_in_tokens,
+        listing_id,
+        deadline_timestamp,
+        from_address,
+        extra_data=b'',
+        token_decimals=6
+    ):
+        """
+        Build the approve + fillListing transaction pair with one batched RPC
+
+        Folds both eth_estimateGas calls and the getFee() read into a single
+        JSON-RPC batch POST instead of three serial round trips. Entries that
+        revert (the fill estimate usually does until the approval is mined)
+        fall back to the same defaults the single-call builders use.
+
+        Args:
+            token_symbol (str): Token symbol ('PYUSD')
+            amount_in_tokens (float): Amount in token units
+            listing_id (str): Listing ID (bytes32 hex string)
+            deadline_timestamp (int): Unix timestamp for delivery deadline
+            from_address (str): Buyer's wallet address
+            extra_data (bytes): Extra data for onchain approval (default empty)
+            token_decimals (int): Token decimals
+
+        Returns:
+            dict: {'approve_transaction', 'fill_transaction', 'entropy_fee'}
+        """
+        # Build both transactions with the default gas bounds; the batch
+        # below overwrites them with real estimates where available
+        approve_tx = self.build_approve_token_transaction(
+            token_symbol, amount_in_tokens, from_address, token_decimals,
+            gas_limit=100000
+        )
+        fill_tx = self.build_fill_listing_transaction(
+            listing_id, deadline_timestamp, from_address, extra_data,
+            gas_limit=2000000
+        )
+
+        calls = [
+            ('eth_estimateGas', [{'from': from_address, 'to': approve_tx['to'], 'data': approve_tx['data']}]),
+            ('eth_estimateGas', [{'from': from_address, 'to': fill_tx['to'], 'data': fill_tx['data']}]),
+            ('eth_call', [{'to': self.escrow_address, 'data': '0x' + self._selectors['getFee'].hex()}, 'latest']),
+        ]
+        try:
+            approve_gas, fill_gas, fee_raw = batch_rpc(calls, self.network_name, strict=False)
+        except Exception as e:
+            logger.warning("Batched checkout RPC failed: %s", e)
+            approve_gas = fill_gas = fee_raw = None
+
+        if approve_gas is not None:
+            approve_tx['gas'] = hex(int(int(approve_gas, 16) * 1.2))
+        if fill_gas is not None:
+            fill_tx['gas'] = hex(int(int(fill_gas, 16) * 1.2))
+        if fee_raw is not None:
+            fee = int(fee_raw, 16)
+            _ENTROPY_FEE_CACHE[self.network_name] = (fee, time.monotonic())
+        else:
+            fee = self.get_entropy_fee()
+
+        return {
+            'approve_transaction': approve_tx,
+            'fill_transaction': fill_tx,
+            'entropy_fee': fee,
+        }
+
+    @_coalesce
     def build_deliver_disputable_transaction(
         self,
         listing_id,
-        from_address=None
+        from_address=None,
+        gas_limit=None
     ):
         """
         Build unsigned transaction for deliverDisputableListing (seller delivers)
@@ -366,29 +696,32 @@ class TransactionBuilder:
             listing_id (str): Listing ID (bytes32 hex string)
             from_address (str): Seller's wallet address
 
+            gas_limit (int): Optional known gas limit; skips estimation
+
         Returns:
             dict: Unsigned transaction data
         """
-        # Build contract function call
-        contract_function = self.escrow_contract.functions.deliverDisputableListing(
-            listing_id
-        )
+        # Fixed-shape calldata: selector || bytes32(listing_id)
+        data = '0x' + (_DELIVER_DISPUTABLE_SELECTOR + _listing_id_word(listing_id)).hex()
 
         # Build transaction
-        transaction = {
-            'to': self.escrow_address,
-            'value': 0,
-            'chainId': self.network_config['chain_id'],
-            'data': contract_function._encode_transaction_data(),
-        }
+        transaction = {**self._escrow_tx_template, 'data': data}
 
         # Add from address if provided
         if from_address:
             transaction['from'] = from_address
 
+        if gas_limit is not None:
+            # Caller already knows the bound; skip the eth_estimateGas round trip
+            transaction['gas'] = hex(gas_limit)
+        elif from_address:
             # Estimate gas
             try:
-                gas_estimate = contract_function.estimate_gas({'from': from_address})
+                gas_estimate = self.w3.eth.estimate_gas({
+                    'from': from_address,
+                    'to': self.escrow_address,
+                    'data': data
+                })
                 transaction['gas'] = hex(int(gas_estimate * 1.2))
             except Exception as e:
                 transaction['gas'] = hex(150000)
@@ -397,10 +730,12 @@ class TransactionBuilder:
 
         return transaction
 
+    @_coalesce
     def build_deliver_onchain_approval_transaction(
         self,
         listing_id,
-        from_address=None
+        from_address=None,
+        gas_limit=None
     ):
         """
         Build unsigned transaction for deliverOnchainApprovalListing (anyone can call)
@@ -409,29 +744,32 @@ class TransactionBuilder:
             listing_id (str): Listing ID (bytes32 hex string)
             from_address (str): Caller's wallet address
 
+            gas_limit (int): Optional known gas limit; skips estimation
+
         Returns:
             dict: Unsigned transaction data
         """
-        # Build contract function call
-        contract_function = self.escrow_contract.functions.deliverOnchainApprovalListing(
-            listing_id
-        )
+        # Fixed-shape calldata: selector || bytes32(listing_id)
+        data = '0x' + (_DELIVER_ONCHAIN_SELECTOR + _listing_id_word(listing_id)).hex()
 
         # Build transaction
-        transaction = {
-            'to': self.escrow_address,
-            'value': 0,
-            'chainId': self.network_config['chain_id'],
-            'data': contract_function._encode_transaction_data(),
-        }
+        transaction = {**self._escrow_tx_template, 'data': data}
 
         # Add from address if provided
         if from_address:
             transaction['from'] = from_address
 
+        if gas_limit is not None:
+            # Caller already knows the bound; skip the eth_estimateGas round trip
+            transaction['gas'] = hex(gas_limit)
+        elif from_address:
             # Estimate gas
             try:
-                gas_estimate = contract_function.estimate_gas({'from': from_address})
+                gas_estimate = self.w3.eth.estimate_gas({
+                    'from': from_address,
+                    'to': self.escrow_address,
+                    'data': data
+                })
                 transaction['gas'] = hex(int(gas_estimate * 1.2))
             except Exception as e:
                 transaction['gas'] = hex(200000)
@@ -440,10 +778,12 @@ class TransactionBuilder:
 
         return transaction
 
+    @_coalesce
     def build_deliver_api_approval_transaction(
         self,
         listing_id,
-        from_address=None
+        from_address=None,
+        gas_limit=None
     ):
         """
         Build unsigned transaction for deliverApiApprovalListing (seller calls after fulfilling)
@@ -452,11 +792,13 @@ class TransactionBuilder:
             listing_id (str): Listing ID (bytes32 hex string)
             from_address (str): Seller's wallet address
 
+            gas_limit (int): Optional known gas limit; skips estimation
+
         Returns:
             dict: Unsigned transaction data
         """
         # Build contract function call with Chainlink params
-        contract_function = self.escrow_contract.functions.deliverApiApprovalListing(
+        contract_function = self._fn_deliver_api_approval(
             listing_id,
             [],  # _sellerArgs (empty, args already in extraData)
             [],  # _sellerBytesArgs (empty)
@@ -464,21 +806,20 @@ class TransactionBuilder:
             CHAINLINK_DON_HOSTED_SECRETS_VERSION,
             CHAINLINK_SUBSCRIPTION_ID,
             CHAINLINK_GAS_LIMIT,
-            CHAINLINK_DON_ID
+            CHAINLINK_DON_ID_BYTES
         )
 
         # Build transaction
-        transaction = {
-            'to': self.escrow_address,
-            'value': 0,
-            'chainId': self.network_config['chain_id'],
-            'data': contract_function._encode_transaction_data(),
-        }
+        transaction = {**self._escrow_tx_template, 'data': contract_function._encode_transaction_data()}
 
         # Add from address if provided
         if from_address:
             transaction['from'] = from_address
 
+        if gas_limit is not None:
+            # Caller already knows the bound; skip the eth_estimateGas round trip
+            transaction['gas'] = hex(gas_limit)
+        elif from_address:
             # Estimate gas
             try:
                 gas_estimate = contract_function.estimate_gas({'from': from_address})
@@ -494,7 +835,8 @@ class TransactionBuilder:
         self,
         listing_id,
         to_buyer,
-        from_address=None
+        from_address=None,
+        gas_limit=None
     ):
         """
         Build unsigned transaction for resolveListing (buyer accepts or rejects)
@@ -504,30 +846,36 @@ class TransactionBuilder:
             to_buyer (bool): True to refund buyer, False to release to seller
             from_address (str): Buyer's or seller's wallet address
 
+            gas_limit (int): Optional known gas limit; skips estimation
+
         Returns:
             dict: Unsigned transaction data
         """
-        # Build contract function call
-        contract_function = self.escrow_contract.functions.resolveListing(
-            listing_id,
-            to_buyer
-        )
+        # Fixed-shape calldata: selector || bytes32(listing_id) || bool word
+        data = '0x' + (
+            _RESOLVE_LISTING_SELECTOR
+            + _listing_id_word(listing_id)
+            + (1 if to_buyer else 0).to_bytes(32, 'big')
+        ).hex()
 
         # Build transaction
-        transaction = {
-            'to': self.escrow_address,
-            'value': 0,
-            'chainId': self.network_config['chain_id'],
-            'data': contract_function._encode_transaction_data(),
-        }
+        transaction = {**self._escrow_tx_template, 'data': data}
 
         # Add from address if provided
         if from_address:
             transaction['from'] = from_address
 
+        if gas_limit is not None:
+            # Caller already knows the bound; skip the eth_estimateGas round trip
+            transaction['gas'] = hex(gas_limit)
+        elif from_address:
             # Estimate gas
             try:
-                gas_estimate = contract_function.estimate_gas({'from': from_address})
+                gas_estimate = self.w3.eth.estimate_gas({
+                    'from': from_address,
+                    'to': self.escrow_address,
+                    'data': data
+                })
                 transaction['gas'] = hex(int(gas_estimate * 1.2))
             except Exception as e:
                 transaction['gas'] = hex(200000)
@@ -536,11 +884,13 @@ class TransactionBuilder:
 
         return transaction
 
+    @_coalesce
     def build_dispute_listing_transaction(
         self,
         listing_id,
         entropy_fee_wei,
-        from_address=None
+        from_address=None,
+        gas_limit=None
     ):
         """
         Build unsigned transaction for disputeListing (buyer or seller disputes)
@@ -550,31 +900,32 @@ class TransactionBuilder:
             entropy_fee_wei (int): Fee for entropy/randomness in wei
             from_address (str): Disputer's wallet address
 
+            gas_limit (int): Optional known gas limit; skips estimation
+
         Returns:
             dict: Unsigned transaction data
         """
-        # Build contract function call
-        contract_function = self.escrow_contract.functions.disputeListing(
-            listing_id
-        )
+        # Fixed-shape calldata: selector || bytes32(listing_id)
+        data = '0x' + (_DISPUTE_LISTING_SELECTOR + _listing_id_word(listing_id)).hex()
 
         # Build transaction (payable function - needs ETH)
-        transaction = {
-            'to': self.escrow_address,
-            'value': hex(entropy_fee_wei),
-            'chainId': self.network_config['chain_id'],
-            'data': contract_function._encode_transaction_data(),
-        }
+        transaction = {**self._escrow_tx_template, 'value': hex(entropy_fee_wei), 'data': data}
 
         # Add from address if provided
         if from_address:
             transaction['from'] = from_address
 
+        if gas_limit is not None:
+            # Caller already knows the bound; skip the eth_estimateGas round trip
+            transaction['gas'] = hex(gas_limit)
+        elif from_address:
             # Estimate gas
             try:
-                gas_estimate = contract_function.estimate_gas({
+                gas_estimate = self.w3.eth.estimate_gas({
                     'from': from_address,
-                    'value': entropy_fee_wei
+                    'to': self.escrow_address,
+                    'value': entropy_fee_wei,
+                    'data': data
                 })
                 transaction['gas'] = hex(int(gas_estimate * 1.2))
             except Exception as e:
@@ -584,19 +935,18 @@ class TransactionBuilder:
 
         return transaction
 
-    def calculate_deadline_timestamp(self, deadline_days):
+    def calculate_deadline_timestamp(self, deadline_days, now=None):
         """
         Calculate deadline timestamp from current time
 
         Args:
             deadline_days (int): Number of days until deadline
+            now (int): Optional time.time() snapshot for bulk callers
 
         Returns:
             int: Unix timestamp
         """
-        current_time = int(time.time())
-        deadline = current_time + (deadline_days * 24 * 60 * 60)
-        return deadline
+        return _add_days(now, deadline_days)
 
     def get_entropy_fee(self):
         """
@@ -606,14 +956,21 @@ class TransactionBuilder:
         Returns:
             int: Fee in wei
         """
+        cached = _ENTROPY_FEE_CACHE.get(self.network_name)
+        if cached is not None and time.monotonic() - cached[1] < _ENTROPY_FEE_TTL:
+            return cached[0]
         try:
             # Call getFee() from contract
-            fee = self.escrow_contract.functions.getFee().call()
-            return fee
+            fee = self._fn_get_fee().call()
         except Exception as e:
-            print(f"Error getting entropy fee: {e}")
+            logger.warning("Error getting entropy fee: %s", e)
+            if cached is not None:
+                # Serve the stale value; closer to reality than the constant
+                return cached[0]
             # Default fallback (0.001 ETH)
             return int(0.001 * 10**18)
+        _ENTROPY_FEE_CACHE[self.network_name] = (fee, time.monotonic())
+        return fee
 
     def create_extra_data_onchain_approval(self, destination, data, expected_result):
         """
@@ -627,7 +984,7 @@ class TransactionBuilder:
         Returns:
             bytes: Extra data
         """
-        return self.w3.eth.abi.encode_abi(['address', 'bytes', 'bytes'], [destination, data, expected_result])
+        return _CODEC.encode(_ONCHAIN_EXTRA_DATA_TYPES, [destination, data, expected_result])
 
     def create_extra_data_api_approval(self, source, encrypted_secrets_urls, args, bytes_args):
         """
@@ -640,8 +997,7 @@ class TransactionBuilder:
             bytes_args (bytes[]): Bytes arguments
 
         """
-        request_id = Web3.to_bytes(hexstr='0x' + '00' * 32)
-        return self.w3.eth.abi.encode_abi(['string', 'bytes', 'string[]', 'bytes[]', 'bytes32'], [source, encrypted_secrets_urls, args, bytes_args, request_id])
+        return _CODEC.encode(_API_EXTRA_DATA_TYPES, [source, encrypted_secrets_urls, args, bytes_args, _ZERO_REQUEST_ID])
 
     def script_flattener(self, script_path):
         """
@@ -653,34 +1009,35 @@ class TransactionBuilder:
         Returns:
             str: Flattened script
         """
-        # TODO: I wrote this one, assuming we will save functions in an static folder and load them from there
-        # Please check if this approach is correct. If not, please rewrite that part. We can also save the scripts in the flatended form in the database.
-        # also I didnt test the python implementation of this function, it needs to be tested.
-        # One last thing, I didnt know where else to put this function, so I put it here. Please move it to the correct place.
-
         if not isinstance(script_path, str):
             raise TypeError("script must be an absolute file path string")
-        script_path = script
         if not os.path.isabs(script_path):
             raise ValueError("Expected an absolute file path for Chainlink Functions script")
         if not os.path.exists(script_path):
             raise FileNotFoundError(f"Chainlink Functions script not found: {script_path}")
 
-        with open(script_path, 'r', encoding='utf-8') as f:
-            script = f.read()
+        # Memoized per (path, mtime) so repeated builds skip the read and
+        # normalization; editing the script on disk invalidates the entry
+        return _flatten_script(script_path, os.stat(script_path).st_mtime_ns)
+
+# Per-network builder registry; builders on the same network share one
+# ContractService and its memoized contracts
+_BUILDERS = {}
 
-        # Normalize content
-        if isinstance(script, bytes):
-            script = script.decode('utf-8', errors='ignore')
-        # Strip UTF-8 BOM if present and normalize newlines
-        script = script.replace('\r\n', '\n').replace('\r', '\n')
-        if script.startswith('\ufeff'):
-            script = script.lstrip('\ufeff')
 
-        # Optionally trim trailing spaces on each line
-        script = '\n'.join(line.rstrip() for line in script.split('\n'))
+def get_transaction_builder(network_name=None):
+    """Get the shared TransactionBuilder for a network, creating it on first use"""
+    key = network_name or DEFAULT_NETWORK
+    builder = _BUILDERS.get(key)
+    if builder is None:
+        builder = _BUILDERS[key] = TransactionBuilder(network_name=key)
+    return builder
 
-        return script
 
-# Create singleton instance
-transaction_builder = TransactionBuilder()
+def __getattr__(name):
+    # Deprecated module-level singleton, kept importable for older scripts.
+    # Resolved lazily so importing this module does no network I/O; prefer
+    # get_transaction_builder()
+    if name == 'transaction_builder':
+        return get_transaction_builder()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
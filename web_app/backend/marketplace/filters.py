@@ -1,5 +1,7 @@
 import django_filters
-from .models import Listing, CurrencyChoices
+from django.db.models import Exists, OuterRef
+
+from .models import Listing, Order, CurrencyChoices
 
 
 class ListingFilter(django_filters.FilterSet):
@@ -24,7 +26,10 @@ class ListingFilter(django_filters.FilterSet):
 
     def filter_buyer(self, queryset, name, value):
         """Filter listings by buyer (through orders)"""
-        return queryset.filter(orders__buyer__id=value).distinct()
+        # EXISTS semi-join instead of JOIN + DISTINCT over full listing rows
+        return queryset.filter(
+            Exists(Order.objects.filter(listing_id=OuterRef('pk'), buyer_id=value))
+        )
 
     class Meta:
         model = Listing
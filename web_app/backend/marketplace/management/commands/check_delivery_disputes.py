@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from marketplace.models import Listing
+
+
+class Command(BaseCommand):
+    help = 'Mark delivered listings whose dispute window has elapsed as dispute-eligible'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window-seconds',
+            type=int,
+            default=10,
+            help='Seconds after delivery before a listing becomes dispute-eligible',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options['window_seconds'])
+        # Single UPDATE instead of loading and saving rows one by one; the
+        # dispute_eligible=False guard keeps repeated cron runs idempotent
+        count = Listing.objects.filter(
+            status='delivered',
+            dispute_eligible=False,
+            updated_at__lt=cutoff,
+        ).update(dispute_eligible=True)
+        self.stdout.write(f"Marked {count} listing(s) dispute-eligible")
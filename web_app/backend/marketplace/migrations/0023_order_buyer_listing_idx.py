@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-08-31 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0022_listing_api_approval_method_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['buyer', 'listing'], name='order_buyer_listing_idx'),
+        ),
+    ]
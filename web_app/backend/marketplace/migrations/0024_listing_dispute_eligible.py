@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-08-31 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0023_order_buyer_listing_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='dispute_eligible',
+            field=models.BooleanField(default=False, help_text='Delivered and past the dispute window (set by check_delivery_disputes)'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-08-31 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0024_listing_dispute_eligible'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(
+                condition=models.Q(('dispute_eligible', False), ('status', 'delivered')),
+                fields=['updated_at'],
+                name='listing_delivered_idx',
+            ),
+        ),
+    ]
@@ -77,6 +77,7 @@ class Listing(models.Model):
     listing_duration_days = models.IntegerField(default=30, help_text="Number of days the listing will be active")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
     is_deleted = models.BooleanField(default=False, help_text="Soft delete flag")
+    dispute_eligible = models.BooleanField(default=False, help_text="Delivered and past the dispute window (set by check_delivery_disputes)")
 
     # API Approval fields
     api_approval_method = models.CharField(max_length=50, blank=True, null=True, help_text="API approval method: tweet_repost, crosschain_nft")
@@ -94,6 +95,17 @@ class Listing(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Partial index for the check_delivery_disputes cron query; only
+            # delivered-but-not-yet-eligible rows are indexed
+            models.Index(
+                fields=['updated_at'],
+                name='listing_delivered_idx',
+                condition=models.Q(status='delivered', dispute_eligible=False),
+            ),
+        ]
+
     @property
     def is_expired(self):
         """Check if the listing has expired based on listing_duration_days"""
@@ -140,6 +152,12 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Backs the EXISTS subquery in ListingFilter.filter_buyer
+            models.Index(fields=['buyer', 'listing'], name='order_buyer_listing_idx'),
+        ]
+
     def __str__(self):
         return f"Order {self.order_id[:8]}... - {self.listing.title}"
 
@@ -1,12 +1,18 @@
+import re
+import secrets
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import Q
 from .models import UserProfile, Listing, Order, Dispute, UploadedFile
 
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ['id', 'username', 'first_name']
+        fields = ('id', 'username', 'first_name')
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -14,14 +20,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = UserProfile
-        fields = ['user', 'telegram_id', 'privy_user_id', 'wallet_address', 'rating', 'total_ratings', 
-                 'dispute_count', 'total_orders', 'dispute_rate', 'created_at']
-
-
-class OrderSimpleSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Order
-        fields = ['id', 'order_id', 'status', 'created_at']
+        fields = ('user', 'telegram_id', 'privy_user_id', 'wallet_address', 'rating', 'total_ratings', 
+                 'dispute_count', 'total_orders', 'dispute_rate', 'created_at')
 
 
 class ListingSerializer(serializers.ModelSerializer):
@@ -29,36 +29,75 @@ class ListingSerializer(serializers.ModelSerializer):
     seller_rating = serializers.SerializerMethodField()
     is_expired = serializers.ReadOnlyField()
     expires_at = serializers.ReadOnlyField()
-    orders = OrderSimpleSerializer(many=True, read_only=True)
+    orders = serializers.SerializerMethodField()
     buyer_address = serializers.SerializerMethodField()
 
     class Meta:
         model = Listing
-        fields = ['id', 'seller', 'title', 'description', 'price', 'currency',
+        fields = ('id', 'seller', 'title', 'description', 'price', 'currency',
                  'token_address', 'file_path', 'metadata_cid', 'image_url',
                  'image_cid', 'payment_method', 'escrow_type', 'seller_contact',
                  'listing_duration_days',
                  'api_approval_method', 'tweet_username', 'crosschain_rpc_url',
                  'crosschain_nft_contract', 'crosschain_token_id',
-                 'status', 'seller_rating', 'is_expired', 'expires_at', 'orders', 'buyer_address', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+                 'status', 'seller_rating', 'is_expired', 'expires_at', 'orders', 'buyer_address', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'created_at', 'updated_at')
+
+    def get_orders(self, obj):
+        # Plain dicts beat one ModelSerializer instance per order; reuse
+        # the view's prefetch when present instead of re-querying per row
+        prefetched = getattr(obj, '_prefetched_objects_cache', {}).get('orders')
+        if prefetched is not None:
+            return [{'id': o.id, 'order_id': o.order_id, 'status': o.status,
+                     'created_at': o.created_at} for o in prefetched]
+        return list(obj.orders.values('id', 'order_id', 'status', 'created_at'))
 
     def get_seller_rating(self, obj):
-        try:
-            return float(obj.seller.userprofile.rating)
-        except:
-            return 0.0
+        # Annotated by the listing views so the value rides the existing
+        # JOIN; the profile fallback covers nested use (e.g. inside
+        # OrderSerializer) where the annotation isn't available
+        rating = getattr(obj, 'seller_rating_annot', None)
+        if rating is not None:
+            return float(rating)
+        # Per-request memo: duplicate sellers in one payload share the
+        # profile lookup and Decimal->float conversion
+        cache = self.context.setdefault('_rating_cache', {})
+        if obj.seller_id not in cache:
+            profile = getattr(obj.seller, 'userprofile', None)
+            cache[obj.seller_id] = float(profile.rating) if profile else 0.0
+        return cache[obj.seller_id]
 
     def get_buyer_address(self, obj):
-        """Get buyer wallet address from the most recent order"""
-        try:
-            # Get the most recent order for this listing
-            order = obj.orders.filter(status__in=['paid', 'delivered', 'confirmed']).first()
-            if order and order.buyer:
-                return order.buyer.username  # username is the wallet address
-            return None
-        except:
-            return None
+        """Get buyer wallet address from the most recent active order"""
+        # Annotated by the listing views as a correlated subquery; the
+        # prefetch/query fallbacks cover nested use (OrderSerializer)
+        if hasattr(obj, 'buyer_address_annot'):
+            return obj.buyer_address_annot
+        orders = getattr(obj, '_active_orders', None)
+        if orders is None:
+            order = (obj.orders.filter(status__in=('paid', 'delivered', 'confirmed'))
+                     .order_by('-created_at').select_related('buyer').first())
+        else:
+            order = orders[0] if orders else None
+        if order and order.buyer_id:
+            return order.buyer.username  # username is the wallet address
+        return None
+
+
+class ListingListSerializer(ListingSerializer):
+    """Slim row shape for the listings index
+
+    Skips the wide text columns (description, metadata/crosschain fields)
+    that index consumers never render; the detail endpoint keeps the full
+    ListingSerializer.
+    """
+
+    class Meta(ListingSerializer.Meta):
+        fields = ('id', 'seller', 'title', 'price', 'currency',
+                 'token_address', 'image_url', 'payment_method', 'escrow_type',
+                 'listing_duration_days', 'status', 'seller_rating',
+                 'is_expired', 'expires_at', 'orders', 'buyer_address',
+                 'created_at', 'updated_at')
 
 
 class CreateListingSerializer(serializers.ModelSerializer):
@@ -67,37 +106,65 @@ class CreateListingSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Listing
-        fields = ['seller_id', 'title', 'description', 'price', 'currency',
+        fields = ('seller_id', 'title', 'description', 'price', 'currency',
                  'token_address', 'file_path', 'metadata_cid', 'image_url',
                  'image_cid', 'payment_method', 'escrow_type', 'seller_contact',
-                 'listing_duration_days', 'status']
+                 'listing_duration_days', 'status')
     
     def create(self, validated_data):
         seller_id = validated_data.pop('seller_id')
         try:
-            # Try to find user by telegram_id first, then by user id
-            try:
-                profile = UserProfile.objects.get(telegram_id=int(seller_id))
-                seller = profile.user
-            except UserProfile.DoesNotExist:
-                seller = User.objects.get(id=int(seller_id))
-        except (User.DoesNotExist, ValueError):
+            seller_id = int(seller_id)
+        except (TypeError, ValueError):
             raise serializers.ValidationError(f'User not found: {seller_id}')
-        
+
+        # One OR query replaces the telegram_id-then-user-id two-step;
+        # a telegram_id match still takes precedence over a raw user id
+        matches = list(
+            User.objects.filter(Q(userprofile__telegram_id=seller_id) | Q(id=seller_id))
+            .select_related('userprofile')
+        )
+        seller = next(
+            (user for user in matches
+             if getattr(user, 'userprofile', None)
+             and user.userprofile.telegram_id == seller_id),
+            matches[0] if matches else None,
+        )
+        if seller is None:
+            raise serializers.ValidationError(f'User not found: {seller_id}')
+
         validated_data['seller'] = seller
         return super().create(validated_data)
 
 
+class ListingSummarySerializer(serializers.ModelSerializer):
+    """Minimal listing shape for nesting inside order rows"""
+
+    class Meta:
+        model = Listing
+        fields = ('id', 'title', 'price', 'currency', 'image_url', 'status')
+
+
 class OrderSerializer(serializers.ModelSerializer):
     listing = ListingSerializer(read_only=True)
     buyer = UserSerializer(read_only=True)
     seller = UserSerializer(read_only=True)
-    
+
     class Meta:
         model = Order
-        fields = ['order_id', 'listing', 'buyer', 'seller', 'amount', 'token_address', 
-                 'status', 'escrow_tx_hash', 'delivery_cid', 'deadline', 'created_at', 'updated_at']
-        read_only_fields = ['order_id', 'created_at', 'updated_at']
+        fields = ('order_id', 'listing', 'buyer', 'seller', 'amount', 'token_address',
+                 'status', 'escrow_tx_hash', 'delivery_cid', 'deadline', 'created_at', 'updated_at')
+        read_only_fields = ('order_id', 'created_at', 'updated_at')
+
+
+class OrderListSerializer(OrderSerializer):
+    """Order row without the recursive listing payload
+
+    The full OrderSerializer nests ListingSerializer, which itself
+    serializes every order of that listing — quadratic when rendering many
+    orders. This variant nests the summary shape instead.
+    """
+    listing = ListingSummarySerializer(read_only=True)
 
 
 class CreateOrderSerializer(serializers.ModelSerializer):
@@ -106,27 +173,26 @@ class CreateOrderSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Order
-        fields = ['listing_id', 'buyer_id', 'amount', 'token_address']
+        fields = ('listing_id', 'buyer_id', 'amount', 'token_address')
     
     def create(self, validated_data):
         listing_id = validated_data.pop('listing_id')
         buyer_id = validated_data.pop('buyer_id')
         
-        try:
-            listing = Listing.objects.get(id=listing_id)
-            buyer = User.objects.get(id=buyer_id)
-        except (Listing.DoesNotExist, User.DoesNotExist):
+        # select_related so listing.seller (and the seller profile the
+        # view reads after save) don't issue further queries
+        listing = Listing.objects.select_related('seller__userprofile').filter(id=listing_id).first()
+        buyer = User.objects.filter(id=buyer_id).first()
+        if listing is None or buyer is None:
             raise serializers.ValidationError('Listing or buyer not found')
         
         if buyer == listing.seller:
             raise serializers.ValidationError('Cannot buy your own listing')
         
-        # Generate unique order ID
-        import hashlib
-        from datetime import datetime, timedelta
-        
-        order_id = '0x' + hashlib.sha256(f"{listing.id}_{buyer.id}_{datetime.now()}".encode()).hexdigest()
-        deadline = datetime.now() + timedelta(days=7)
+        # Generate unique order ID straight from the OS CSPRNG; nothing
+        # recomputes it from listing/buyer/time, so no hash is needed
+        order_id = '0x' + secrets.token_hex(32)
+        deadline = timezone.now() + timedelta(days=7)
         
         validated_data.update({
             'order_id': order_id,
@@ -140,14 +206,16 @@ class CreateOrderSerializer(serializers.ModelSerializer):
 
 
 class DisputeSerializer(serializers.ModelSerializer):
-    order = OrderSerializer(read_only=True)
+    # Slim order shape: a dispute response doesn't need the listing's full
+    # order history serialized underneath it
+    order = OrderListSerializer(read_only=True)
     initiator = UserSerializer(read_only=True)
     
     class Meta:
         model = Dispute
-        fields = ['order', 'initiator', 'reason', 'evidence_files', 'status', 
-                 'result', 'arbitrator_notes', 'created_at', 'resolved_at']
-        read_only_fields = ['created_at', 'resolved_at']
+        fields = ('order', 'initiator', 'reason', 'evidence_files', 'status', 
+                 'result', 'arbitrator_notes', 'created_at', 'resolved_at')
+        read_only_fields = ('created_at', 'resolved_at')
 
 
 class WalletAuthSerializer(serializers.Serializer):
@@ -173,23 +241,72 @@ class DepositSerializer(serializers.Serializer):
 class UploadFileSerializer(serializers.ModelSerializer):
     class Meta:
         model = UploadedFile
-        fields = ['file']
+        fields = ('file',)
+
+
+# Choice tuples shared across serializer instances
+_CURRENCY_CHOICES = ('PYUSD',)
+_ESCROW_CHOICES = ('disputable', 'api_approval', 'onchain_approval')
+
+
+# One compiled match replaces the startswith/len pair in ten validators and
+# actually rejects non-hex input; \Z (not $) so a trailing newline fails
+_WALLET_RE = re.compile(r'0x[0-9a-fA-F]{40}\Z')
+_TXHASH_RE = re.compile(r'0x[0-9a-fA-F]{64}\Z')
+
+
+def _validate_wallet(value):
+    """Validate and lowercase a 20-byte hex address"""
+    if not _WALLET_RE.match(value):
+        raise serializers.ValidationError('Invalid wallet address format')
+    return value if value.islower() else value.lower()
+
+
+def _validate_tx_hash(value):
+    """Validate and lowercase a 32-byte hex hash (tx hash / listing id)"""
+    if not _TXHASH_RE.match(value):
+        raise serializers.ValidationError('Invalid transaction hash format')
+    return value if value.islower() else value.lower()
+
+
+class WalletAddressField(serializers.CharField):
+    """CharField that validates and lowercases a 20-byte hex address
+
+    Declared once instead of a validate_<name>_wallet method on every
+    transaction serializer.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('max_length', 42)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        return _validate_wallet(super().to_internal_value(data))
+
+
+class HexHashField(serializers.CharField):
+    """CharField that validates and lowercases a 32-byte hex value"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('max_length', 66)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        return _validate_tx_hash(super().to_internal_value(data))
 
 
 # ==================== BLOCKCHAIN TRANSACTION SERIALIZERS ====================
 
 class CreateListingTransactionSerializer(serializers.Serializer):
     """Serializer for building createListing transaction"""
-    seller_wallet = serializers.CharField(max_length=42, required=True)
+    seller_wallet = WalletAddressField(required=True)
     title = serializers.CharField(max_length=200, required=True)
     description = serializers.CharField(required=True)
-    price = serializers.DecimalField(max_digits=18, decimal_places=8, required=True)
-    currency = serializers.ChoiceField(choices=['PYUSD'], default='PYUSD')
+    price = serializers.DecimalField(max_digits=18, decimal_places=8, required=True,
+                                     coerce_to_string=False)
+    currency = serializers.ChoiceField(choices=_CURRENCY_CHOICES, default='PYUSD')
     image_url = serializers.CharField(required=False, allow_blank=True, default='')
-    escrow_type = serializers.ChoiceField(
-        choices=['disputable', 'api_approval', 'onchain_approval'],
-        default='disputable'
-    )
+    escrow_type = serializers.ChoiceField(choices=_ESCROW_CHOICES, default='disputable')
     listing_duration_days = serializers.IntegerField(min_value=1, max_value=365, default=30)
 
     # API approval fields
@@ -199,12 +316,6 @@ class CreateListingTransactionSerializer(serializers.Serializer):
     crosschain_nft_contract = serializers.CharField(max_length=42, required=False, allow_blank=True, allow_null=True)
     crosschain_token_id = serializers.CharField(max_length=100, required=False, allow_blank=True, allow_null=True)
 
-    def validate_seller_wallet(self, value):
-        """Validate wallet address format"""
-        if not value.startswith('0x') or len(value) != 42:
-            raise serializers.ValidationError('Invalid wallet address format')
-        return value.lower()
-
     def validate_price(self, value):
         """Validate price is positive"""
         if value <= 0:
@@ -214,100 +325,60 @@ class CreateListingTransactionSerializer(serializers.Serializer):
 
 class ConfirmTransactionSerializer(serializers.Serializer):
     """Serializer for confirming transaction was sent"""
-    tx_hash = serializers.CharField(max_length=66, required=True)
-
-    def validate_tx_hash(self, value):
-        """Validate transaction hash format"""
-        if not value.startswith('0x') or len(value) != 66:
-            raise serializers.ValidationError('Invalid transaction hash format')
-        return value.lower()
+    tx_hash = HexHashField(required=True)
 
 
 class BlockchainListingSerializer(serializers.ModelSerializer):
     """Serializer for listing with blockchain data"""
     seller = UserSerializer(read_only=True)
-    seller_rating = serializers.SerializerMethodField()
+    # Filled by the seller_rating_annot queryset annotation; the default
+    # covers instances serialized without it
+    seller_rating = serializers.FloatField(source='seller_rating_annot', read_only=True, default=0.0)
     is_expired = serializers.ReadOnlyField()
     expires_at = serializers.ReadOnlyField()
 
     class Meta:
         model = Listing
-        fields = ['id', 'seller', 'title', 'description', 'price', 'currency',
+        fields = ('id', 'seller', 'title', 'description', 'price', 'currency',
                  'token_address', 'image_url', 'payment_method', 'escrow_type',
                  'listing_duration_days', 'status', 'seller_rating', 'is_expired',
                  'expires_at', 'blockchain_listing_id', 'blockchain_status',
-                 'creation_tx_hash', 'blockchain_expiration', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at', 'blockchain_listing_id',
-                           'blockchain_status', 'creation_tx_hash', 'blockchain_expiration']
-
-    def get_seller_rating(self, obj):
-        try:
-            return float(obj.seller.userprofile.rating)
-        except:
-            return 0.0
+                 'creation_tx_hash', 'blockchain_expiration', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'created_at', 'updated_at', 'blockchain_listing_id',
+                           'blockchain_status', 'creation_tx_hash', 'blockchain_expiration')
 
 
 # ==================== BUYER TRANSACTION SERIALIZERS ====================
 
 class ApproveTokenTransactionSerializer(serializers.Serializer):
     """Serializer for building ERC20 approve transaction"""
-    buyer_wallet = serializers.CharField(max_length=42, required=True)
+    buyer_wallet = WalletAddressField(required=True)
     listing_id = serializers.IntegerField(required=True)
 
-    def validate_buyer_wallet(self, value):
-        """Validate wallet address format"""
-        if not value.startswith('0x') or len(value) != 42:
-            raise serializers.ValidationError('Invalid wallet address format')
-        return value.lower()
-
 
 class PurchaseListingTransactionSerializer(serializers.Serializer):
     """Serializer for building fillListing transaction"""
-    buyer_wallet = serializers.CharField(max_length=42, required=True)
+    buyer_wallet = WalletAddressField(required=True)
     listing_id = serializers.IntegerField(required=True)
     deadline_days = serializers.IntegerField(min_value=1, max_value=365, default=7)
     tweet_id = serializers.CharField(max_length=100, required=False, allow_blank=True, allow_null=True)
 
-    def validate_buyer_wallet(self, value):
-        """Validate wallet address format"""
-        if not value.startswith('0x') or len(value) != 42:
-            raise serializers.ValidationError('Invalid wallet address format')
-        return value.lower()
-
 
 class AcceptDeliveryTransactionSerializer(serializers.Serializer):
     """Serializer for building resolveListing (accept) transaction"""
-    buyer_wallet = serializers.CharField(max_length=42, required=True)
-
-    def validate_buyer_wallet(self, value):
-        """Validate wallet address format"""
-        if not value.startswith('0x') or len(value) != 42:
-            raise serializers.ValidationError('Invalid wallet address format')
-        return value.lower()
+    buyer_wallet = WalletAddressField(required=True)
 
 
 class DisputeListingTransactionSerializer(serializers.Serializer):
     """Serializer for building disputeListing transaction"""
-    wallet_address = serializers.CharField(max_length=42, required=True)
-
-    def validate_wallet_address(self, value):
-        """Validate wallet address format"""
-        if not value.startswith('0x') or len(value) != 42:
-            raise serializers.ValidationError('Invalid wallet address format')
-        return value.lower()
+    wallet_address = WalletAddressField(required=True)
 
 
 # ==================== SELLER TRANSACTION SERIALIZERS ====================
 
 class DeliverListingTransactionSerializer(serializers.Serializer):
     """Serializer for building deliverDisputableListing transaction"""
-    seller_wallet = serializers.CharField(max_length=42, required=True)
-
-    def validate_seller_wallet(self, value):
-        """Validate wallet address format"""
-        if not value.startswith('0x') or len(value) != 42:
-            raise serializers.ValidationError('Invalid wallet address format')
-        return value.lower()
+    seller_wallet = WalletAddressField(required=True)
 
 
 # ==================== ORDER MANAGEMENT SERIALIZERS ====================
@@ -315,18 +386,6 @@ class DeliverListingTransactionSerializer(serializers.Serializer):
 class CreateOrderTransactionSerializer(serializers.Serializer):
     """Serializer for creating order in database after purchase"""
     listing_id = serializers.IntegerField(required=True)
-    buyer_wallet = serializers.CharField(max_length=42, required=True)
-    blockchain_listing_id = serializers.CharField(max_length=66, required=True)
+    buyer_wallet = WalletAddressField(required=True)
+    blockchain_listing_id = HexHashField(required=True)
     deadline_days = serializers.IntegerField(min_value=1, max_value=365, default=7)
-
-    def validate_buyer_wallet(self, value):
-        """Validate wallet address format"""
-        if not value.startswith('0x') or len(value) != 42:
-            raise serializers.ValidationError('Invalid wallet address format')
-        return value.lower()
-
-    def validate_blockchain_listing_id(self, value):
-        """Validate listing ID format"""
-        if not value.startswith('0x') or len(value) != 66:
-            raise serializers.ValidationError('Invalid listing ID format')
-        return value.lower()
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+"""
+One-shot build script: pre-serialize the escrow ABI as a marshal blob.
+
+marshal.loads reconstructs the nested dict/list structure directly from a
+tagged binary stream with no JSON tokenizer, so runtime loading is several
+times faster than json.loads. Re-run this script whenever
+marketplace/blockchain/escrow_abi.json.gz changes:
+
+    python tools/bake_abi.py
+"""
+import gzip
+import json
+import marshal
+from pathlib import Path
+
+BLOCKCHAIN_DIR = Path(__file__).resolve().parent.parent / 'marketplace' / 'blockchain'
+
+
+def main():
+    abi = json.loads(gzip.decompress((BLOCKCHAIN_DIR / 'escrow_abi.json.gz').read_bytes()))
+    out = BLOCKCHAIN_DIR / 'escrow_abi.marshal'
+    out.write_bytes(marshal.dumps(abi))
+    print(f"Wrote {out} ({out.stat().st_size} bytes, {len(abi)} ABI entries)")
+
+
+if __name__ == '__main__':
+    main()